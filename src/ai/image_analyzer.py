@@ -1,5 +1,6 @@
 import io
 import os
+import json
 
 import pillow_avif
 from pillow_heif import register_heif_opener
@@ -34,7 +35,7 @@ class ImageAnalyzer():
         for label in response.label_annotations:
             image_labels.append(
                 {
-                    'score':f"{label.score:4.0%}",
+                    'score':label.score,
                     'description':f"{label.description:5}"
                 }
             )
@@ -114,4 +115,59 @@ class ImageAnalyzer():
 
         except Exception as e:
             logger.exception(f"An error occurred: {e}")
-            raise e
\ No newline at end of file
+            raise e
+        
+    def categorize_images_batch(self, categories:list, image_labels_list:list[list])->list[str]:
+        """
+        Categorize several images in one completion. Returns one category per entry of
+        `image_labels_list`, in order. Raises ValueError if the response does not have that shape
+        """
+        images_text = "\n".join(
+            f"Image {idx} labels : {image_labels}" for idx, image_labels in enumerate(image_labels_list, start=1)
+        )
+        try:
+            response = self.openai_client.chat.completions.create(
+                model=settings.OpenAI.Classification.CHAT_MODEL,
+                messages=[
+                    {
+                        "role": "system", 
+                        "content": [{
+                            "type": "text",
+                            "text": f"""
+                                    You are a classification assistant. You are provided with a list of categories {categories}
+                                    and, for each of several numbered images, a list of labels describing that image.
+                                    Your task is to read and understand each image's features and determine which single category best fits it.
+                                    
+                                    Respond with a JSON object of the form {{"categories": [...]}} holding exactly one category name
+                                    per image, in image order, and no additional commentary. Every entry must be one of the categories in the list provided.
+                                    """    
+                        }]
+                    },
+                    {
+                        "role": "user",
+                        "content": [{
+                            "type": "text",
+                            "text": images_text
+                        }]
+                    },
+                ],
+                temperature=0.1,
+                max_tokens=1024,
+                top_p=1,
+                frequency_penalty=0,
+                presence_penalty=0,
+                response_format={
+                    "type": "json_object"
+                }
+            )
+            
+        except Exception as e:
+            logger.exception(f"An error occurred: {e}")
+            raise e
+        
+        result = json.loads(response.choices[0].message.content).get('categories')
+        if not isinstance(result, list) or len(result) != len(image_labels_list) \
+            or not all(isinstance(category, str) for category in result):
+            raise ValueError(f"Expected {len(image_labels_list)} categories in batch response, got '{result}'")
+        
+        return [category.strip() for category in result]
@@ -1,5 +1,5 @@
 from pathlib import Path
-from typing import Iterator, Literal
+from typing import Final, Iterator, Literal
 import abc
 
 from openai import OpenAI
@@ -10,23 +10,23 @@ from config.config import settings
 from utils.audio_utils import *
 from movie_maker.movie_model import MovieModel
 
+_VALID_FORMATS: Final[frozenset[str]] = frozenset({'mp3', 'wav'})
+
 class TTS():
     def __init__(self):
         # Check feature flags before initializing engines
-        if settings.Engines.TTS == 'ElevenLabs':
-            if settings.FeatureFlags.ENABLE_ELEVEN_LABS:
-                self.engine = TTS_ElevenLabs()
-            else:
-                logger.warning("ElevenLabs TTS disabled via feature flag - using mock TTS engine")
-                self.engine = TTS_Mock()
-        elif settings.Engines.TTS == 'OpenAI':
-            if settings.FeatureFlags.ENABLE_OPENAI:
-                self.engine = TTS_OpenAI()
-            else:
-                logger.warning("OpenAI TTS disabled via feature flag - using mock TTS engine")
-                self.engine = TTS_Mock()
+        engine_name = settings.Engines.TTS
+        engine_entry = _TTS_ENGINE_REGISTRY.get(engine_name)
+        if engine_entry is None:
+            logger.warning(f"Unknown TTS engine '{engine_name}' - using mock TTS engine")
+            self.engine = TTS_Mock()
+            return
+        
+        engine_cls, feature_flag = engine_entry
+        if getattr(settings.FeatureFlags, feature_flag):
+            self.engine = engine_cls()
         else:
-            logger.warning(f"Unknown TTS engine '{settings.Engines.TTS}' - using mock TTS engine")
+            logger.warning(f"{engine_name} TTS disabled via feature flag - using mock TTS engine")
             self.engine = TTS_Mock()
         
     def generate_voiceover(self, file_path:Path, 
@@ -103,6 +103,13 @@ class TTS_ElevenLabs(TTSBase):
         self.client = ElevenLabs(
             api_key=secret_mgr.secret(settings.Secret.ELEVEN_LABS_API_KEY)
         )
+    
+    @staticmethod
+    def _map_format(output_format:str)->str:
+        try:
+            return TTS_ElevenLabs.FORMAT_MAP[output_format]
+        except KeyError:
+            raise ValueError(f"Unsupported output format: {output_format}. Supported formats: {', '.join(sorted(_VALID_FORMATS))}")
         
     def generate_voiceover(self, script:str, voice:str=None, output_format:Literal['mp3', 'wav']='wav')->Iterator[bytes]:
         if not settings.FeatureFlags.ENABLE_ELEVEN_LABS or self.client is None:
@@ -119,7 +126,7 @@ class TTS_ElevenLabs(TTSBase):
                 use_speaker_boost=settings.ElevenLabs.TTS.VoiceSettings.USE_SPEAKER_BOOST
             ),
             'text': script,
-            'output_format': TTS_ElevenLabs.FORMAT_MAP[output_format]
+            'output_format': TTS_ElevenLabs._map_format(output_format)
         }
             
         return self.client.generate(**kwargs)
@@ -132,6 +139,12 @@ class TTS_Mock(TTSBase):
         # Return empty audio data - this will result in silent videos
         return iter([])
 
+# Engine name (settings.Engines.TTS) -> (engine class, feature flag gating it)
+_TTS_ENGINE_REGISTRY: dict[str, tuple[type[TTSBase], str]] = {
+    'ElevenLabs': (TTS_ElevenLabs, 'ENABLE_ELEVEN_LABS'),
+    'OpenAI': (TTS_OpenAI, 'ENABLE_OPENAI'),
+}
+
 def main():
     import argparse
     
@@ -149,8 +162,8 @@ def main():
     output_path = Path(args.output_file)
     output_format = output_path.suffix.lstrip('.')
     
-    if output_format not in ('mp3', 'wav'):
-        raise ValueError(f"Unsupported output format: {output_format}. Supported formats: mp3, wav")
+    if output_format not in _VALID_FORMATS:
+        raise ValueError(f"Unsupported output format: {output_format}. Supported formats: {', '.join(sorted(_VALID_FORMATS))}")
     
     # Create output directory if needed
     output_path.parent.mkdir(parents=True, exist_ok=True)
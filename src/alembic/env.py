@@ -1,9 +1,9 @@
 import os
 import sys
+from functools import lru_cache
 from logging.config import fileConfig
 
 from sqlalchemy import engine_from_config, create_engine
-from sqlalchemy import pool
 
 from alembic import context
 
@@ -20,6 +20,7 @@ from database.models.video import Video
 
 # Import configuration
 from config.config import settings
+from logger import logger
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -34,18 +35,24 @@ if config.config_file_name is not None:
 target_metadata = Base.metadata
 
 
+# Verbose connection diagnostics are opt-in - migrations run at container boot
+ALEMBIC_VERBOSE = bool(os.getenv('ALEMBIC_VERBOSE'))
+
+
+@lru_cache(maxsize=1)
 def get_database_url() -> str:
-    """Get database URL based on environment"""
+    """Get database URL based on environment (resolved once per process)"""
     environment = os.getenv('ENVIRONMENT', 'dev')
     
-    print(f"[ALEMBIC] Environment: {environment}")
-    print(f"[ALEMBIC] All environment variables starting with DB_:")
-    for key, value in os.environ.items():
-        if key.startswith('DB_'):
-            if 'PASSWORD' in key:
-                print(f"[ALEMBIC]   {key}: ***")
-            else:
-                print(f"[ALEMBIC]   {key}: {value}")
+    logger.debug(f"[ALEMBIC] Environment: {environment}")
+    if ALEMBIC_VERBOSE:
+        logger.debug(f"[ALEMBIC] All environment variables starting with DB_:")
+        for key, value in os.environ.items():
+            if key.startswith('DB_'):
+                if 'PASSWORD' in key:
+                    logger.debug(f"[ALEMBIC]   {key}: ***")
+                else:
+                    logger.debug(f"[ALEMBIC]   {key}: {value}")
     
     if environment == 'prod':
         # Production: Try DATABASE_URL first, then RENDER_* vars
@@ -80,16 +87,17 @@ def get_database_url() -> str:
         
         ssl_mode = "disable" if not settings.PostgreSQL.DEV.SSL_REQUIRED else "require"
         
-        print(f"[ALEMBIC] Development database configuration:")
-        print(f"[ALEMBIC]   Host: {host} (from env: {os.getenv('DB_HOST', 'NOT SET')}, config: {settings.PostgreSQL.DEV.HOST})")
-        print(f"[ALEMBIC]   Port: {port} (from env: {os.getenv('DB_PORT', 'NOT SET')}, config: {settings.PostgreSQL.DEV.PORT})")
-        print(f"[ALEMBIC]   Username: {username} (from env: {os.getenv('DB_USER', 'NOT SET')})")
-        print(f"[ALEMBIC]   Password: {'***' if password else 'NOT SET'} (from env: {'***' if os.getenv('DB_PASSWORD') else 'NOT SET'})")
-        print(f"[ALEMBIC]   Database: {database} (from env: {os.getenv('DB_NAME', 'NOT SET')}, config: {settings.PostgreSQL.DEV.DATABASE})")
-        print(f"[ALEMBIC]   SSL Mode: {ssl_mode}")
+        if ALEMBIC_VERBOSE:
+            logger.debug(f"[ALEMBIC] Development database configuration:")
+            logger.debug(f"[ALEMBIC]   Host: {host} (from env: {os.getenv('DB_HOST', 'NOT SET')}, config: {settings.PostgreSQL.DEV.HOST})")
+            logger.debug(f"[ALEMBIC]   Port: {port} (from env: {os.getenv('DB_PORT', 'NOT SET')}, config: {settings.PostgreSQL.DEV.PORT})")
+            logger.debug(f"[ALEMBIC]   Username: {username} (from env: {os.getenv('DB_USER', 'NOT SET')})")
+            logger.debug(f"[ALEMBIC]   Password: {'***' if password else 'NOT SET'} (from env: {'***' if os.getenv('DB_PASSWORD') else 'NOT SET'})")
+            logger.debug(f"[ALEMBIC]   Database: {database} (from env: {os.getenv('DB_NAME', 'NOT SET')}, config: {settings.PostgreSQL.DEV.DATABASE})")
+            logger.debug(f"[ALEMBIC]   SSL Mode: {ssl_mode}")
         
         database_url = f"postgresql://{username}:{password}@{host}:{port}/{database}?sslmode={ssl_mode}"
-        print(f"[ALEMBIC] Final database URL: postgresql://{username}:***@{host}:{port}/{database}?sslmode={ssl_mode}")
+        logger.debug(f"[ALEMBIC] Final database URL: postgresql://{username}:***@{host}:{port}/{database}?sslmode={ssl_mode}")
         
         return database_url
 
@@ -112,6 +120,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        transaction_per_migration=True,
     )
 
     with context.begin_transaction():
@@ -128,20 +137,28 @@ def run_migrations_online() -> None:
     # Get database URL based on environment
     database_url = get_database_url()
     
-    # Create engine with the environment-specific URL
+    # Create engine with the environment-specific URL. A single pooled connection
+    # is held for the whole migration session and released on dispose
     connectable = create_engine(
         database_url,
-        poolclass=pool.NullPool,
+        pool_pre_ping=False,
+        pool_size=1,
+        max_overflow=0,
+        pool_recycle=-1,
     )
 
-    with connectable.connect() as connection:
-        context.configure(
-            connection=connection, 
-            target_metadata=target_metadata
-        )
-
-        with context.begin_transaction():
-            context.run_migrations()
+    try:
+        with connectable.connect() as connection:
+            context.configure(
+                connection=connection, 
+                target_metadata=target_metadata,
+                transaction_per_migration=True,
+            )
+
+            with context.begin_transaction():
+                context.run_migrations()
+    finally:
+        connectable.dispose()
 
 
 if context.is_offline_mode():
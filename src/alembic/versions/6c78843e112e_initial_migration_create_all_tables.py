@@ -9,6 +9,7 @@ from typing import Sequence, Union
 
 from alembic import op
 import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
 
 
 # revision identifiers, used by Alembic.
@@ -17,55 +18,69 @@ down_revision: Union[str, Sequence[str], None] = None
 branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
+# Binary JSON on PostgreSQL, plain JSON elsewhere
+JSONType = sa.JSON().with_variant(postgresql.JSONB(), 'postgresql')
+
 
 def upgrade() -> None:
     """Upgrade schema."""
+    # All DDL below runs in the one migration transaction; skip the per-commit WAL flush wait.
+    # SET LOCAL is scoped to that transaction, so nothing needs resetting afterwards
+    if op.get_context().dialect.name == 'postgresql':
+        op.execute("SET LOCAL synchronous_commit = OFF")
+    
     # Create projects table
     op.create_table('projects',
         sa.Column('id', sa.String(), primary_key=True),
         sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
         sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
-        sa.Column('metadata', sa.JSON(), default={}),
+        sa.Column('metadata', JSONType, default={}),
         sa.Column('user_id', sa.String(), nullable=False),
         sa.Column('name', sa.String(), nullable=True),
         sa.Column('description', sa.Text(), nullable=True),
         sa.Column('status', sa.String(), nullable=False, default='active'),
-        sa.Column('settings', sa.JSON(), default={}),
+        sa.Column('settings', JSONType, nullable=False, server_default='{}'),
         sa.Column('template_id', sa.String(), nullable=True),
-        sa.Column('style_preferences', sa.JSON(), default={})
+        sa.Column('style_preferences', JSONType, default={})
     )
     op.create_index('ix_projects_user_id', 'projects', ['user_id'])
+    # Active projects for a user
+    op.create_index('ix_projects_user_status', 'projects', ['user_id', 'status'],
+                    postgresql_where=sa.text("status = 'active'"))
     
     # Create project_versions table
     op.create_table('project_versions',
         sa.Column('id', sa.String(), primary_key=True),
         sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
         sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
-        sa.Column('metadata', sa.JSON(), default={}),
+        sa.Column('metadata', JSONType, default={}),
         sa.Column('project_id', sa.String(), sa.ForeignKey('projects.id'), nullable=False),
         sa.Column('version_number', sa.Integer(), nullable=False),
         sa.Column('name', sa.String(), nullable=True),
         sa.Column('status', sa.String(), nullable=False, default='draft'),
         sa.Column('is_current', sa.Boolean(), nullable=False, default=False),
-        sa.Column('configuration', sa.JSON(), default={}),
-        sa.Column('processing_log', sa.JSON(), default=[]),
-        sa.Column('output_urls', sa.JSON(), default={})
+        sa.Column('configuration', JSONType, nullable=False, server_default='{}'),
+        sa.Column('processing_log', JSONType, default=[]),
+        sa.Column('output_urls', JSONType, default={})
     )
     op.create_index('ix_project_versions_project_id', 'project_versions', ['project_id'])
+    # Current version of a project
+    op.create_index('ix_project_versions_project_current', 'project_versions', ['project_id'],
+                    postgresql_where=sa.text('is_current'))
     
     # Create properties table
     op.create_table('properties',
         sa.Column('id', sa.String(), primary_key=True),
         sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
         sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
-        sa.Column('metadata', sa.JSON(), default={}),
+        sa.Column('metadata', JSONType, default={}),
         sa.Column('project_id', sa.String(), sa.ForeignKey('projects.id'), nullable=False),
         sa.Column('address', sa.Text(), nullable=False),
         sa.Column('formatted_address', sa.Text(), nullable=True),
         sa.Column('place_id', sa.String(), nullable=True),
         sa.Column('latitude', sa.Float(), nullable=True),
         sa.Column('longitude', sa.Float(), nullable=True),
-        sa.Column('address_components', sa.JSON(), default={}),
+        sa.Column('address_components', JSONType, default={}),
         sa.Column('title', sa.String(), nullable=True),
         sa.Column('description', sa.Text(), nullable=True),
         sa.Column('property_type', sa.String(), nullable=True),
@@ -85,13 +100,13 @@ def upgrade() -> None:
         sa.Column('tenant_id', sa.String(), nullable=True),
         sa.Column('extraction_time', sa.DateTime(), nullable=True),
         sa.Column('last_updated', sa.DateTime(), nullable=True),
-        sa.Column('images', sa.JSON(), default=[]),
-        sa.Column('videos', sa.JSON(), default=[]),
-        sa.Column('virtual_tours', sa.JSON(), default=[]),
-        sa.Column('classification_data', sa.JSON(), default={}),
-        sa.Column('image_analysis', sa.JSON(), default={}),
-        sa.Column('features', sa.JSON(), default=[]),
-        sa.Column('amenities', sa.JSON(), default=[])
+        sa.Column('images', JSONType, default=[]),
+        sa.Column('videos', JSONType, default=[]),
+        sa.Column('virtual_tours', JSONType, default=[]),
+        sa.Column('classification_data', JSONType, nullable=False, server_default='{}'),
+        sa.Column('image_analysis', JSONType, default={}),
+        sa.Column('features', JSONType, default=[]),
+        sa.Column('amenities', JSONType, default=[])
     )
     op.create_index('ix_properties_project_id', 'properties', ['project_id'])
     
@@ -100,7 +115,7 @@ def upgrade() -> None:
         sa.Column('id', sa.String(), primary_key=True),
         sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
         sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
-        sa.Column('metadata', sa.JSON(), default={}),
+        sa.Column('metadata', JSONType, default={}),
         sa.Column('project_id', sa.String(), sa.ForeignKey('projects.id'), nullable=False),
         sa.Column('user_id', sa.String(), nullable=False),
         sa.Column('name', sa.String(), nullable=True),
@@ -108,15 +123,15 @@ def upgrade() -> None:
         sa.Column('session_type', sa.String(), nullable=False, default='movie_generation'),
         sa.Column('status', sa.String(), nullable=False, default='active'),
         sa.Column('progress_percentage', sa.Integer(), nullable=False, default=0),
-        sa.Column('configuration', sa.JSON(), default={}),
-        sa.Column('input_parameters', sa.JSON(), default={}),
-        sa.Column('processing_log', sa.JSON(), default=[]),
-        sa.Column('error_log', sa.JSON(), default=[]),
+        sa.Column('configuration', JSONType, nullable=False, server_default='{}'),
+        sa.Column('input_parameters', JSONType, default={}),
+        sa.Column('processing_log', JSONType, default=[]),
+        sa.Column('error_log', JSONType, default=[]),
         sa.Column('started_at', sa.DateTime(), nullable=True),
         sa.Column('completed_at', sa.DateTime(), nullable=True),
         sa.Column('estimated_completion', sa.DateTime(), nullable=True),
-        sa.Column('output_data', sa.JSON(), default={}),
-        sa.Column('generated_assets', sa.JSON(), default=[])
+        sa.Column('output_data', JSONType, default={}),
+        sa.Column('generated_assets', JSONType, default=[])
     )
     op.create_index('ix_sessions_project_id', 'sessions', ['project_id'])
     op.create_index('ix_sessions_user_id', 'sessions', ['user_id'])
@@ -126,7 +141,7 @@ def upgrade() -> None:
         sa.Column('id', sa.String(), primary_key=True),
         sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
         sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
-        sa.Column('metadata', sa.JSON(), default={}),
+        sa.Column('metadata', JSONType, default={}),
         sa.Column('session_id', sa.String(), sa.ForeignKey('sessions.id'), nullable=False),
         sa.Column('project_version_id', sa.String(), sa.ForeignKey('project_versions.id'), nullable=True),
         sa.Column('user_id', sa.String(), nullable=False),
@@ -140,36 +155,37 @@ def upgrade() -> None:
         sa.Column('status', sa.String(), nullable=False, default='pending'),
         sa.Column('processing_progress', sa.Integer(), nullable=False, default=0),
         sa.Column('template_id', sa.String(), nullable=True),
-        sa.Column('template_data', sa.JSON(), default={}),
-        sa.Column('edl_data', sa.JSON(), default={}),
+        sa.Column('template_data', JSONType, default={}),
+        sa.Column('edl_data', JSONType, nullable=False, server_default='{}'),
         sa.Column('has_voiceover', sa.Boolean(), nullable=False, default=False),
-        sa.Column('voiceover_config', sa.JSON(), default={}),
-        sa.Column('background_music', sa.JSON(), default={}),
-        sa.Column('audio_levels', sa.JSON(), default={}),
-        sa.Column('captions_config', sa.JSON(), default={}),
-        sa.Column('effects_config', sa.JSON(), default={}),
-        sa.Column('watermark_config', sa.JSON(), default={}),
+        sa.Column('voiceover_config', JSONType, default={}),
+        sa.Column('background_music', JSONType, default={}),
+        sa.Column('audio_levels', JSONType, default={}),
+        sa.Column('captions_config', JSONType, default={}),
+        sa.Column('effects_config', JSONType, default={}),
+        sa.Column('watermark_config', JSONType, default={}),
         sa.Column('output_url', sa.Text(), nullable=True),
         sa.Column('preview_url', sa.Text(), nullable=True),
-        sa.Column('source_files', sa.JSON(), default=[]),
-        sa.Column('processing_log', sa.JSON(), default=[]),
-        sa.Column('error_log', sa.JSON(), default=[]),
+        sa.Column('source_files', JSONType, default=[]),
+        sa.Column('processing_log', JSONType, default=[]),
+        sa.Column('error_log', JSONType, default=[]),
         sa.Column('started_at', sa.DateTime(), nullable=True),
         sa.Column('completed_at', sa.DateTime(), nullable=True),
         sa.Column('render_time', sa.Float(), nullable=True),
-        sa.Column('quality_settings', sa.JSON(), default={}),
+        sa.Column('quality_settings', JSONType, default={}),
         sa.Column('file_size', sa.Integer(), nullable=True)
     )
     op.create_index('ix_movies_session_id', 'movies', ['session_id'])
     op.create_index('ix_movies_project_version_id', 'movies', ['project_version_id'])
     op.create_index('ix_movies_user_id', 'movies', ['user_id'])
+    op.create_index('ix_movies_session_status', 'movies', ['session_id', 'status'])
     
     # Create videos table
     op.create_table('videos',
         sa.Column('id', sa.String(), primary_key=True),
         sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
         sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
-        sa.Column('metadata', sa.JSON(), default={}),
+        sa.Column('metadata', JSONType, default={}),
         sa.Column('session_id', sa.String(), sa.ForeignKey('sessions.id'), nullable=True),
         sa.Column('project_version_id', sa.String(), sa.ForeignKey('project_versions.id'), nullable=True),
         sa.Column('user_id', sa.String(), nullable=False),
@@ -197,20 +213,23 @@ def upgrade() -> None:
         sa.Column('status', sa.String(), nullable=False, default='uploaded'),
         sa.Column('processing_progress', sa.Integer(), nullable=False, default=0),
         sa.Column('is_classified', sa.Boolean(), nullable=False, default=False),
-        sa.Column('classification_data', sa.JSON(), default={}),
-        sa.Column('keyframes', sa.JSON(), default=[]),
+        sa.Column('classification_data', JSONType, nullable=False, server_default='{}'),
+        sa.Column('keyframes', JSONType, default=[]),
         sa.Column('quality_score', sa.Float(), nullable=True),
-        sa.Column('technical_metadata', sa.JSON(), default={}),
-        sa.Column('processing_config', sa.JSON(), default={}),
-        sa.Column('scene_detection_config', sa.JSON(), default={}),
+        sa.Column('technical_metadata', JSONType, nullable=False, server_default='{}'),
+        sa.Column('processing_config', JSONType, default={}),
+        sa.Column('scene_detection_config', JSONType, default={}),
         sa.Column('uploaded_at', sa.DateTime(), nullable=True),
         sa.Column('processed_at', sa.DateTime(), nullable=True),
-        sa.Column('processing_errors', sa.JSON(), default=[])
+        sa.Column('processing_errors', JSONType, default=[])
     )
     op.create_index('ix_videos_session_id', 'videos', ['session_id'])
     op.create_index('ix_videos_project_version_id', 'videos', ['project_version_id'])
     op.create_index('ix_videos_user_id', 'videos', ['user_id'])
     op.create_index('ix_videos_project_id', 'videos', ['project_id'])
+    # Classified videos in a project
+    op.create_index('ix_videos_project_classified', 'videos', ['project_id', 'is_classified'])
+    op.create_index('ix_videos_classification_gin', 'videos', ['classification_data'], postgresql_using='gin')
 
 
 def downgrade() -> None:
@@ -1,57 +1,65 @@
-from rich import print
-import re
 import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-from google.cloud.firestore_v1.document import DocumentReference
+from google.cloud.firestore_v1.document import DocumentReference, DocumentSnapshot
 
 from config.config import settings
 from logger import logger
 from gcp.db import db_client
 from utils.session_utils import get_session_refs_by_ids
-from classification.classification_model import ImageBuckets
 
-def derive_property_id(project_id:str, project_ref:DocumentReference)->str:
+# Max concurrent Firestore get/update round trips when backfilling all projects
+BACKFILL_MAX_WORKERS = 32
+# Only fields read by the backfill - keeps the projects stream light
+BACKFILL_PROJECT_FIELDS = [settings.Classification.IMAGE_CLASSIFICATION_KEY, 'property_id']
+
+def derive_property_id(project_id:str, project_dict:dict)->str:
     """
     Derives the property_id from the Firestore document by extracting the first occurrence of
     a gs:// URL from the 'editora-v2-properties' bucket in the image classification.
 
     Args:
         project_id (str): The project ID.
-        project_ref (DocumentReference, optional): Firestore document reference.
+        project_dict (dict): Already fetched project document data.
 
     Returns:
         str: Derived property_id or None if not found.
     """
 
-    if not project_id and not project_ref:
-        raise ValueError("Project ID & document reference are required to derive property_id.")
+    if not project_id and not project_dict:
+        raise ValueError("Project ID & document data are required to derive property_id.")
 
-    project_dict = project_ref.get().to_dict()
-    
     if not settings.Classification.IMAGE_CLASSIFICATION_KEY in project_dict.keys():
         return None
     
-    buckets = ImageBuckets.model_validate(project_dict[settings.Classification.IMAGE_CLASSIFICATION_KEY])
-    for category, items in buckets.buckets.items():
+    # Only `uri` is read, so walk the raw classification dict rather than validating ImageBuckets
+    buckets = project_dict[settings.Classification.IMAGE_CLASSIFICATION_KEY].get('buckets', {})
+    gs_bucket = f"gs://{settings.GCP.Storage.PROPERTIES_BUCKET}/"
+    for items in buckets.values():
         for item in items:
-            gs_bucket = f"gs://{settings.GCP.Storage.PROPERTIES_BUCKET}"
-            if gs_bucket in item.uri:
-                match = re.search(rf'{gs_bucket}/(.*?)/', item.uri)
-                if match:
-                    return match.group(1)
-    
+            uri = item.get('uri', '')
+            if not uri.startswith(gs_bucket):
+                continue
+            # gs://<bucket>/<property_id>/... -> ['gs:', '', '<bucket>', '<property_id>', '...'].
+            # URIs without a property folder (gs://<bucket>/photo.jpg) are skipped
+            parts = uri.split('/', 4)
+            if len(parts) == 5 and parts[3]:
+                return parts[3]
     return None
 
-def backfill_project(project_id:str, project_ref:DocumentReference):
+def backfill_project(project_id:str, project_ref:DocumentReference, project_doc:DocumentSnapshot=None):
+    # Single read - the snapshot is reused for derivation and the mapped check
+    if project_doc is None:
+        project_doc = project_ref.get(field_paths=BACKFILL_PROJECT_FIELDS)
+    if not project_doc.exists:
+        raise ValueError(f"Project doesn't exist for ID {project_id}")
+    project_dict = project_doc.to_dict()
+    
     property_id = derive_property_id(
         project_id=project_id,
-        project_ref=project_ref
+        project_dict=project_dict
     )
     if property_id:
-        project_doc = project_ref.get()    
-        if not project_doc.exists:
-            raise ValueError(f"Project doesn't exist for ID {project_id}")
-        project_dict = project_doc.to_dict()
         mapped_property_id = project_dict.get('property_id', None)
         if mapped_property_id:
             logger.info(f'Project {project_id} - Already mapped to property {property_id}. No-op')
@@ -75,11 +83,28 @@ def backfill_projects_for_user(user_id:str, project_id:str=None):
         user_ref, _, _ = get_session_refs_by_ids(
             user_id=user_id,
         )
-        for project_ref in user_ref.collection(settings.GCP.Firestore.PROJECTS_COLLECTION_NAME).list_documents():
-            backfill_project(
-                project_id=project_ref.id,
-                project_ref=project_ref
-            )
+        # Projection keeps the payload to the fields we read. Filtering on `property_id == None`
+        # server side would skip projects where the field was never set, so the mapped check stays here
+        projects_ref = user_ref.collection(settings.GCP.Firestore.PROJECTS_COLLECTION_NAME)
+        with ThreadPoolExecutor(max_workers=BACKFILL_MAX_WORKERS) as executor:
+            futures = {}
+            for project_doc in projects_ref.select(BACKFILL_PROJECT_FIELDS).stream():
+                project_dict = project_doc.to_dict()
+                if project_dict.get('property_id') or \
+                    settings.Classification.IMAGE_CLASSIFICATION_KEY not in project_dict:
+                    continue
+                future = executor.submit(
+                    backfill_project,
+                    project_id=project_doc.id,
+                    project_ref=project_doc.reference,
+                    project_doc=project_doc
+                )
+                futures[future] = project_doc.id
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    logger.error(f'Project {futures[future]} - Backfill failed: {e}')
 
 def main():
     # Parse command-line arguments
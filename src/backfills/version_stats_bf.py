@@ -1,7 +1,13 @@
-from rich import print
-import re
 import argparse
+import json
+import threading
+import grpc
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
+from google.api_core.exceptions import NotFound
+from google.cloud.firestore_v1.base_query import FieldFilter
+from google.cloud.firestore_v1.bulk_writer import BulkWriter, BulkWriteFailure
 from google.cloud.firestore_v1.document import DocumentReference
 
 from config.config import settings
@@ -9,37 +15,46 @@ from logger import logger
 from gcp.db import db_client
 from utils.session_utils import get_session_refs_by_ids
 from utils.common_models import ActionStatus
-from classification.classification_model import ImageBuckets
 
 PROJECT_VERSION_STATS_KEY = 'version_stats'
 PROJECT_VERSION_STATE_STATS_KEY = 'state'
 PROJECT_VERSION_VIEWED_STATS_KEY = 'viewed'
 
+# Max concurrent projects in flight when backfilling all projects
+BACKFILL_MAX_WORKERS = 32
+# Max users backfilled concurrently (each runs its own project pool)
+USER_FANOUT_MAX_WORKERS = 8
+# BulkWriter is shared by the backfill workers but does not guard its own batch state
+_bulk_writer_lock = threading.Lock()
+BULK_WRITER_MAX_ATTEMPTS = 10
+
+@lru_cache(maxsize=1024)
+def _session_refs(user_id:str, project_id:str=None):
+    # Refs only depend on the IDs - resolve each (user, project) once per run
+    return get_session_refs_by_ids(user_id=user_id, project_id=project_id)
+
+def _count(query)->int:
+    return query.count().get()[0][0].value
+
+def _state_filter(state:ActionStatus.State)->FieldFilter:
+    # ActionStatus.State matches case-insensitively but Firestore filters are exact - count the
+    # canonical, lowercase and uppercase spellings, as derive_version_stats in project_backfill does
+    return FieldFilter('status.state', 'in', list(dict.fromkeys((state.value, state.value.lower(), state.value.upper()))))
+
 def derive_version_stats(project_id:str, project_ref:DocumentReference)->str:
     if not project_id and not project_ref:
         raise ValueError("Project ID & document reference are required to derive property_id.")
     
-    success_count = 0
-    failure_count = 0
-    pending_count = 0
-    
-    unviewed_count = 0
-    
+    # Server-side COUNT aggregations - no version documents are transferred or parsed
     versions_ref = project_ref.collection(settings.GCP.Firestore.VERSIONS_COLLECTION_NAME)
-    count_query = versions_ref.count()
     try:
-        for vdoc in versions_ref.stream():
-            version = vdoc.to_dict()
-            status = ActionStatus.model_validate(version.get('status'))
-            if status.state == ActionStatus.State.SUCCESS:
-                success_count += 1
-                viewed = version.get('viewed', False)
-                if not viewed:
-                    unviewed_count += 1 
-            elif status.state == ActionStatus.State.PENDING:
-                pending_count += 1
-            elif status.state == ActionStatus.State.FAILURE:
-                failure_count += 1
+        success_query = versions_ref.where(filter=_state_filter(ActionStatus.State.SUCCESS))
+        success_count = _count(success_query)
+        pending_count = _count(versions_ref.where(filter=_state_filter(ActionStatus.State.PENDING)))
+        failure_count = _count(versions_ref.where(filter=_state_filter(ActionStatus.State.FAILURE)))
+        # A missing `viewed` field counts as unviewed, so subtract the explicitly viewed ones
+        viewed_count = _count(success_query.where(filter=FieldFilter('viewed', '==', True)))
+        unviewed_count = success_count - viewed_count
         
         version_stats_dict = {
             PROJECT_VERSION_STATE_STATS_KEY : {
@@ -56,31 +71,38 @@ def derive_version_stats(project_id:str, project_ref:DocumentReference)->str:
     except Exception as e:
         logger.exception(e)
         raise e
-        
-    
-    return None
 
-def backfill_project(project_id:str, project_ref:DocumentReference):
+def _on_write_error(error:BulkWriteFailure, writer:BulkWriter)->bool:
+    if error.code == grpc.StatusCode.NOT_FOUND.value[0]:
+        logger.error(f"Project doesn't exist for path {error.operation.reference.path}")
+        return False # Not retryable
+    return error.attempts < BULK_WRITER_MAX_ATTEMPTS
+
+def backfill_project(project_id:str, project_ref:DocumentReference, writer:BulkWriter=None):
     version_stats = derive_version_stats(
         project_id=project_id,
         project_ref=project_ref
     )
     if version_stats:
-        project_doc = project_ref.get()    
-        if not project_doc.exists:
-            raise ValueError(f"Project doesn't exist for ID {project_id}")
-        project_dict = project_doc.to_dict()
-        existing_version_stats = project_dict.get(PROJECT_VERSION_STATS_KEY, None)
-        if existing_version_stats:
-            logger.info(f'Project {project_id} - Version stats already exist. Overwriting')
-        project_ref.update({PROJECT_VERSION_STATS_KEY:version_stats})
-        logger.info(f'Project {project_id} - Added version stats')
+        # No existence pre-read: update() fails with NotFound for a missing project
+        if writer is not None:
+            with _bulk_writer_lock:
+                writer.update(project_ref, {PROJECT_VERSION_STATS_KEY:version_stats})
+            logger.info(f'Project {project_id} - Queued version stats')
+            logger.debug(f'Project {project_id} - Version stats payload: {json.dumps(version_stats, separators=(",", ":"))}')
+        else:
+            try:
+                project_ref.update({PROJECT_VERSION_STATS_KEY:version_stats})
+            except NotFound:
+                raise ValueError(f"Project doesn't exist for ID {project_id}")
+            logger.info(f'Project {project_id} - Added version stats')
+            logger.debug(f'Project {project_id} - Version stats payload: {json.dumps(version_stats, separators=(",", ":"))}')
     else:
         logger.info(f'Project {project_id} - Could not derive version stats')
     
 def backfill_projects_for_user(user_id:str, project_id:str=None):
     if project_id:
-        user_ref, project_ref, _ = get_session_refs_by_ids(
+        user_ref, project_ref, _ = _session_refs(
             user_id=user_id,
             project_id=project_id
         )
@@ -89,27 +111,67 @@ def backfill_projects_for_user(user_id:str, project_id:str=None):
             project_ref=project_ref
         )
     else: # All projects
-        user_ref, _, _ = get_session_refs_by_ids(
+        user_ref, _, _ = _session_refs(
             user_id=user_id,
         )
-        for project_ref in user_ref.collection(settings.GCP.Firestore.PROJECTS_COLLECTION_NAME).list_documents():
-            backfill_project(
-                project_id=project_ref.id,
-                project_ref=project_ref
-            )
+        # Empty projection streams only document names, in large pages, instead of
+        # list_documents()' small default pages
+        projects_ref = user_ref.collection(settings.GCP.Firestore.PROJECTS_COLLECTION_NAME)
+        project_refs = (project_doc.reference for project_doc in projects_ref.select([]).stream())
+        # Updates are coalesced into batched commits and flushed on close
+        writer = db_client.bulk_writer()
+        writer.on_write_error(_on_write_error)
+        try:
+            with ThreadPoolExecutor(max_workers=BACKFILL_MAX_WORKERS) as executor:
+                futures = {
+                    executor.submit(backfill_project, project_id=project_ref.id, project_ref=project_ref, writer=writer): project_ref.id
+                    for project_ref in project_refs
+                }
+                for future in as_completed(futures):
+                    try:
+                        future.result()
+                    except Exception as e:
+                        logger.error(f'Project {futures[future]} - Backfill failed: {e}')
+        finally:
+            writer.close()
+
+def backfill_projects_for_users(user_ids:list[str], project_id:str=None):
+    if len(user_ids) == 1:
+        backfill_projects_for_user(user_id=user_ids[0], project_id=project_id)
+        return
+    
+    # One process (and one Firestore client) for every user instead of one invocation per user
+    with ThreadPoolExecutor(max_workers=USER_FANOUT_MAX_WORKERS) as executor:
+        futures = {
+            executor.submit(backfill_projects_for_user, user_id=user_id, project_id=project_id): user_id
+            for user_id in user_ids
+        }
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:
+                logger.error(f'User {futures[future]} - Backfill failed: {e}')
 
 def main():
     # Parse command-line arguments
     parser = argparse.ArgumentParser(description="Version Stats Backfiller")
 
-    # Create a mutually exclusive group to ensure user chooses either file or directory mode, not both
-    parser.add_argument("-u", "--user_id", type=str, required=True, help="User ID")
-    parser.add_argument("-p", "--project_id", type=str, required=True, help="Project ID")
+    # Users are given either inline or through a file, not both
+    users_group = parser.add_mutually_exclusive_group(required=True)
+    users_group.add_argument("-u", "--user_id", type=str, nargs='+', help="User ID(s)")
+    users_group.add_argument("--users-file", type=str, help="File with one user ID per line")
+    parser.add_argument("-p", "--project_id", type=str, required=True, help="Project ID or 'all'")
     
     args = parser.parse_args()
     
-    backfill_projects_for_user(
-        user_id=args.user_id,
+    if args.users_file:
+        with open(args.users_file, 'r') as f:
+            user_ids = [line.strip() for line in f if line.strip()]
+    else:
+        user_ids = args.user_id
+    
+    backfill_projects_for_users(
+        user_ids=user_ids,
         project_id=args.project_id \
             if args.project_id != 'all' \
                 else None
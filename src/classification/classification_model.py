@@ -1,7 +1,12 @@
-from pydantic import BaseModel, Field, field_serializer
-from typing import Dict, List, Tuple, Optional
+from pydantic import BaseModel, BeforeValidator, Field, field_serializer, field_validator
+import sys
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Annotated, Dict, List, Tuple, Optional
 from enum import Enum
 
+import numpy as np
+
 class HeroSelectionEnum(str, Enum):
     FILENAME = 'Filename' # Choose 1st image based on lexicographic sorting
     HIGH_SCORE = 'High_Score' # Image with the highest score based on the category rankings for the 1st image
@@ -20,21 +25,68 @@ class RealEstate(BaseModel):
         # Convert integer keys to strings at serialization time
         return {str(k): v for k, v in value.items()}
     
+def _parse_label_score(value):
+    # Legacy labels stored the score as a percentage string, e.g. ' 94%'
+    if isinstance(value, str):
+        value = value.strip()
+        return float(value[:-1]) / 100 if value.endswith('%') else float(value)
+    return value
+
+class BucketSoA():
+    """
+    Struct-of-arrays view of a single bucket - parallel `uris` and `int16` `scores` (scores are
+    small feature counts), so ranking is a vectorized argsort instead of attribute access per item
+    """
+    __slots__ = ('uris', 'scores')
+    
+    def __init__(self, uris:list[str], scores:np.ndarray):
+        self.uris = uris
+        self.scores = scores
+        
+    @classmethod
+    def from_items(cls, items:list) -> 'BucketSoA':
+        return cls(
+            uris=[item.uri for item in items],
+            scores=np.fromiter((item.score for item in items), dtype=np.int16, count=len(items))
+        )
+        
+    def argsort_desc(self) -> np.ndarray:
+        # Stable, so equal scores keep their bucket order
+        return np.argsort(-self.scores, kind='stable')
+    
 class ImageBuckets(BaseModel):
-    class ImageInfo(BaseModel):
-        class Label(BaseModel):
-            score:str = Field(..., description='Probability/Confidence score of a particular feature in the image')
-            description:str = Field(..., description='Description of the label')
-        category: str = Field(..., description='Category of the image computed from the features')
-        uri:str = Field(..., description='File path of the image')
-        labels:list[Label] = Field(..., description='List of features for an image')
-        score:int = Field(..., description='Image `score` - Count of all features detected for image by vision API')
+    # Per-image types are slotted dataclasses - created once per image, so they skip BaseModel's
+    # per-instance overhead. Pydantic still validates/serializes them as fields of ImageBuckets
+    @dataclass(slots=True)
+    class ImageInfo:
+        @dataclass(slots=True, frozen=True)
+        class Label:
+            score: Annotated[float, BeforeValidator(_parse_label_score), Field(ge=0.0, le=1.0, description='Probability/Confidence score of a particular feature in the image')]
+            description: Annotated[str, Field(description='Description of the label')]
+        category: Annotated[str, Field(description='Category of the image computed from the features')]
+        uri: Annotated[str, Field(description='File path of the image')]
+        labels: Annotated[list[Label], Field(description='List of features for an image')]
+        score: Annotated[int, Field(description='Image `score` - Count of all features detected for image by vision API')]
         
-    class Item(BaseModel):
-        uri:str = Field(..., description='File path of the image')
-        score:int = Field(..., description='Image `score` - Count of all features detected for image by vision API')
+    @dataclass(slots=True, frozen=True)
+    class Item:
+        uri: Annotated[str, Field(description='File path of the image')]
+        score: Annotated[int, Field(description='Image `score` - Count of all features detected for image by vision API')]
     
     buckets:Dict[str, List[Item]] = Field(default={}, description='Images bucketed into categories')
+    
+    @field_validator('buckets', mode='before')
+    @classmethod
+    def intern_categories(cls, value):
+        # Category names come from a small fixed vocabulary - share one string object per name
+        if isinstance(value, dict):
+            return {sys.intern(category) if isinstance(category, str) else category: items for category, items in value.items()}
+        return value
+    
+    @cached_property
+    def soa(self) -> Dict[str, BucketSoA]:
+        """ Per-category SoA view, built on first access. Snapshot - not refreshed if `buckets` is mutated """
+        return {category: BucketSoA.from_items(items) for category, items in self.buckets.items()}
 
 class ImageSequence(BaseModel):
     class ImageInfo(BaseModel):
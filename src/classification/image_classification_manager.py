@@ -1,12 +1,18 @@
 import argparse
-import random
 import concurrent.futures
+from collections import deque
+from functools import lru_cache
 from typing import Dict, List, Optional, Callable
 from tempfile import TemporaryDirectory
 from pathlib import Path
 import os
 import uuid
 import json
+import hashlib
+import heapq
+import itertools
+import re
+import numpy as np
 from rich import print
 
 from config.config import settings
@@ -17,15 +23,200 @@ from gcp.storage import StorageManager
 from gcp.storage_model import CloudPath
 from classification.classification_model import (
     RealEstate, HeroSelectionEnum, ImageSequence, 
-    ImageBuckets
+    ImageBuckets, BucketSoA
 )
 from ai.image_analyzer import ImageAnalyzer
 
+# Long-lived pool for the per-image Vision / LLM calls. Shared across runs so threads are reused
+# and total in-flight requests stay bounded no matter how many classifications run concurrently
+_api_executor = concurrent.futures.ThreadPoolExecutor(
+    max_workers=settings.Classification.MAX_CONCURRENT_REQUESTS,
+    thread_name_prefix='classification-api'
+)
+
+# Filename words that identify an image's category outright, e.g. `kitchen_02.jpg` or `floorplan.png`.
+# Only unambiguous room words - listing filenames carry addresses and descriptions (`123-main-street`,
+# `3-bed-2-bath`, `open-plan-living`), so words like 'street', 'bed' or even most category names are left out
+_FILENAME_CATEGORY_KEYWORDS = {
+    'Exterior': ['exterior', 'facade'],
+    'Living': ['livingroom', 'familyroom'],
+    'Dining': ['diningroom'],
+    'Kitchen': ['kitchen', 'kitchenette'],
+    'Bedroom': ['bedroom', 'guestroom'],
+    'Bathroom': ['bathroom', 'washroom', 'ensuite'],
+    'Backyard': ['backyard'],
+    'Plan': ['floorplan'],
+}
+
+@lru_cache(maxsize=1)
+def _shared_image_analyzer() -> ImageAnalyzer:
+    # Built on first use and shared by every manager/worker - the Vision (gRPC) and OpenAI (httpx)
+    # clients are thread-safe, so there is no need to pay client + TLS setup per image
+    return ImageAnalyzer()
+
+@lru_cache(maxsize=1)
+def _default_real_estate_model() -> RealEstate:
+    # Built and validated once per process - managers only read it, never mutate it
+    logger.info("Loaded Real Estate classification model LOCALLY")
+    
+    return RealEstate(
+        categories=['Exterior', 'Living', 'Dining', 'Kitchen', 'Bedroom', 'Bathroom', 'Pool', 'Backyard', 'Neighborhood', 'Plan', 'Other'],
+        hero_image=settings.Classification.ENABLE_HERO_SHOT,
+        hero_selection=HeroSelectionEnum.FILENAME,
+        boundary_priorities_small={
+            '1': ["Exterior", "Backyard", "Living"],  # 1st clip
+            '-1': ["Pool", "Backyard", "Neighborhood", "Exterior"],  # Last clip
+        },
+        boundary_priorities_large={
+            '1': ["Exterior", "Backyard", "Living"],  # 1st clip
+            '-2': ["Pool", "Backyard", "Neighborhood", "Living", "Kitchen"],  # Second last clip
+            '-1': ["Neighborhood", "Backyard", "Exterior", "Pool"],  # Last clip
+        },
+        interior_order=["Living", "Dining", "Kitchen", "Bedroom"]
+    )
+
+# Entries written by this process - the cache dir is pruned every _CACHE_PRUNE_EVERY writes
+_cache_writes = itertools.count(1)
+_CACHE_PRUNE_EVERY = 100
+
+def _cache_get(key: str) -> Optional[object]:
+    if not settings.Classification.ENABLE_RESPONSE_CACHE:
+        return None
+    try:
+        return json.loads(Path(settings.Classification.RESPONSE_CACHE_DIR, f"{key}.json").read_text())
+    except (FileNotFoundError, ValueError):
+        return None
+
+def _cache_put(key: str, value: object):
+    if not settings.Classification.ENABLE_RESPONSE_CACHE:
+        return
+    try:
+        cache_dir = Path(settings.Classification.RESPONSE_CACHE_DIR)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        # Write-then-rename so concurrent workers never read a partial entry
+        tmp_path = cache_dir / f"{key}.{uuid.uuid4().hex}.tmp"
+        tmp_path.write_text(json.dumps(value))
+        os.replace(tmp_path, cache_dir / f"{key}.json")
+        if next(_cache_writes) % _CACHE_PRUNE_EVERY == 0:
+            _cache_prune(cache_dir)
+    except OSError as e:
+        logger.warning(f"Failed to write classification cache entry '{key}': {e}")
+
+def _cache_prune(cache_dir: Path):
+    """
+    Keep the RESPONSE_CACHE_MAX_ENTRIES most recently written entries - reads don't touch an entry's
+    mtime, so the oldest writes go first
+    """
+    entries = []
+    for entry in os.scandir(cache_dir):
+        if entry.name.endswith('.json'):
+            try:
+                entries.append((entry.stat().st_mtime, entry.path))
+            except FileNotFoundError:  # Pruned by another worker
+                pass
+    excess = len(entries) - settings.Classification.RESPONSE_CACHE_MAX_ENTRIES
+    if excess <= 0:
+        return
+    for _, path in heapq.nsmallest(excess, entries):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+    logger.debug(f"Pruned {excess} classification cache entries")
+
+class _WeightedBucket():
+    """
+    Fenwick (binary indexed) tree over one bucket's scores - a weighted draw and a swap-pop
+    removal are both O(log k), instead of rebuilding the cumulative weights on every pick
+    """
+    __slots__ = ('weights', 'tree', 'total')
+    
+    def __init__(self, weights: List[int]):
+        self.weights = list(weights)
+        self.total = sum(self.weights)
+        # Linear-time build: push each node's sum up to its parent
+        tree = [0] + self.weights
+        for i in range(1, len(tree)):
+            parent = i + (i & -i)
+            if parent < len(tree):
+                tree[parent] += tree[i]
+        self.tree = tree
+        
+    def _add(self, idx: int, delta: int):
+        i = idx + 1
+        while i < len(self.tree):
+            self.tree[i] += delta
+            i += i & -i
+            
+    def find(self, target: float) -> int:
+        """
+        Index of the item whose cumulative-weight span contains `target` (0 <= target < total)
+        """
+        pos = 0
+        step = 1 << (len(self.tree) - 1).bit_length()
+        while step:
+            nxt = pos + step
+            if nxt < len(self.tree) and self.tree[nxt] <= target:
+                pos = nxt
+                target -= self.tree[nxt]
+            step >>= 1
+        return pos
+    
+    def sample(self, rng: np.random.Generator) -> int:
+        if self.total <= 0:
+            raise ValueError('Total of weights must be greater than zero')
+        # Float round-off can leave the draw at the total - clamp to the last item
+        return min(self.find(rng.uniform(0, self.total)), len(self.weights) - 1)
+    
+    def pop(self, idx: int):
+        """
+        Swap-pop, mirroring the removal done on the bucket's item list. Tree capacity is kept,
+        trailing slots just hold zero weight
+        """
+        last = len(self.weights) - 1
+        last_weight = self.weights[last]
+        self._add(idx, last_weight - self.weights[idx])
+        self._add(last, -last_weight)
+        self.total -= self.weights[idx]
+        self.weights[idx] = last_weight
+        self.weights.pop()
+
 class ImageClassificationManager():
     def __init__(self):
-        self.model = self.load_real_estate_model_local()
+        self.model = _default_real_estate_model()
         self.classification_service = classification_storage_service
         self.session_manager = unified_session_manager
+        self._rng = np.random.default_rng()
+        
+    @property
+    def model(self) -> RealEstate:
+        return self._model
+    
+    @model.setter
+    def model(self, model: RealEstate):
+        # Derived lookups used by rank / gen_sequence, rebuilt only when the model changes
+        self._model = model
+        self._categories_set = frozenset(model.categories)
+        self._interior_order = tuple(model.interior_order)
+        self._fallback_categories = tuple(cat for cat in model.categories if cat not in self._interior_order)
+        self._filename_hints = {
+            keyword.lower(): cat
+            for cat in model.categories
+            for keyword in _FILENAME_CATEGORY_KEYWORDS.get(cat, [])
+        }
+        
+    def category_from_filename(self, image_file_path: str) -> Optional[str]:
+        """
+        Category named by the words of the file's basename, or None when no word - or words of more
+        than one category (`kitchen-to-diningroom.jpg`) - name it. Whole words only, so `kitchen`
+        does not match `kitchener_ave.jpg`
+        """
+        categories = {
+            self._filename_hints[word]
+            for word in re.split(r'[^a-z]+', Path(image_file_path).stem.lower())
+            if word in self._filename_hints
+        }
+        return categories.pop() if len(categories) == 1 else None
         
     def save_real_estate_model(self, model: RealEstate):
         try:
@@ -79,34 +270,37 @@ class ImageClassificationManager():
             logger.exception(f"Failed to load classification model from database: {e}")
             raise e
         
-    def load_real_estate_model_local(self) -> RealEstate:
-        logger.info("Loaded Real Estate classification model LOCALLY")
-        
-        return RealEstate(
-            categories=['Exterior', 'Living', 'Dining', 'Kitchen', 'Bedroom', 'Bathroom', 'Pool', 'Backyard', 'Neighborhood', 'Plan', 'Other'],
-            hero_image=settings.Classification.ENABLE_HERO_SHOT,
-            hero_selection=HeroSelectionEnum.FILENAME,
-            boundary_priorities_small={
-                '1': ["Exterior", "Backyard", "Living"],  # 1st clip
-                '-1': ["Pool", "Backyard", "Neighborhood", "Exterior"],  # Last clip
-            },
-            boundary_priorities_large={
-                '1': ["Exterior", "Backyard", "Living"],  # 1st clip
-                '-2': ["Pool", "Backyard", "Neighborhood", "Living", "Kitchen"],  # Second last clip
-                '-1': ["Neighborhood", "Backyard", "Exterior", "Pool"],  # Last clip
-            },
-            interior_order=["Living", "Dining", "Kitchen", "Bedroom"]
-        )
-                        
     def label_image(self, image_file_path: str) -> ImageBuckets.ImageInfo:
-        image_analyzer = ImageAnalyzer()
+        # Fast path - the filename already says what the image is, skip Vision and the LLM
+        if settings.Classification.ENABLE_FILENAME_HINTS:
+            category = self.category_from_filename(image_file_path)
+            if category:
+                return ImageBuckets.ImageInfo(
+                    category=category,
+                    uri=image_file_path,
+                    labels=[],
+                    score=settings.Classification.FILENAME_HINT_SCORE
+                )
         
-        response = image_analyzer.analyze_image_from_uri(
-            image_file_path=image_file_path, 
-            num_features=settings.Classification.MAX_LABELS
-        )
+        # Re-runs of a project mostly see the same photos - key the Vision labels on image content
+        cache_key = None
+        image_labels = None
+        if settings.Classification.ENABLE_RESPONSE_CACHE:
+            image_hash = hashlib.sha256(Path(image_file_path).read_bytes()).hexdigest()
+            cache_key = f"labels-{settings.Classification.MAX_LABELS}-{image_hash}"
+            image_labels = _cache_get(cache_key)
         
-        image_labels = image_analyzer.labels(response=response)
+        if image_labels is None:
+            image_analyzer = _shared_image_analyzer()
+            
+            response = image_analyzer.analyze_image_from_uri(
+                image_file_path=image_file_path, 
+                num_features=settings.Classification.MAX_LABELS
+            )
+            
+            image_labels = image_analyzer.labels(response=response)
+            if cache_key:
+                _cache_put(cache_key, image_labels)
                     
         return ImageBuckets.ImageInfo(
             category='',
@@ -121,49 +315,88 @@ class ImageClassificationManager():
             score = max(len(image_labels), 1)
         )
         
+    def _label_image_safe(self, image_file_path: str) -> Optional[ImageBuckets.ImageInfo]:
+        # One bad image must not fail the whole batch
+        try:
+            return self.label_image(image_file_path)
+        except Exception as exc:
+            logger.error(f"Image {image_file_path} generated an exception: {exc}")
+            return None
+        
     def label_images(self, image_file_paths: List[str]) -> List[ImageBuckets.ImageInfo]:
-        images_data = []
-            
-        # Use ThreadPoolExecutor for I/O-bound tasks (e.g., API calls)
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            futures = {
-                executor.submit(self.label_image, img_file_path): img_file_path
-                for img_file_path in image_file_paths
-            }
-
-            # Process results as they complete
-            for future in concurrent.futures.as_completed(futures):
-                img = futures[future]
-                try:
-                    result = future.result()
-                    images_data.append(result)
-                except Exception as exc:
-                    logger.error(f"Image {img} generated an exception: {exc}")
+        # I/O-bound tasks (e.g., API calls) on the shared pool, results in input order
+        images_data = [
+            image for image in _api_executor.map(self._label_image_safe, image_file_paths)
+            if image is not None
+        ]
+        
+        filename_hits = sum(1 for image in images_data if image.category)
+        logger.info(f"Filename hints classified {filename_hits}/{len(images_data)} images without Vision/LLM calls")
                     
         return images_data
     
+    @staticmethod
+    def _category_cache_key(categories: List[str], image_labels: List[dict]) -> str:
+        key_source = json.dumps([categories, image_labels], sort_keys=True)
+        return f"category-{hashlib.sha256(key_source.encode()).hexdigest()}"
+    
+    def _categorize_batch(self, image_analyzer: ImageAnalyzer, image_labels_list: List[List[dict]]) -> List[str]:
+        try:
+            categories = image_analyzer.categorize_images_batch(
+                categories=self.model.categories,
+                image_labels_list=image_labels_list
+            )
+        except Exception as e:
+            # Malformed batch answer - fall back to one completion per image
+            logger.warning(f"Batch categorization of {len(image_labels_list)} images failed, retrying per image: {e}")
+            categories = [
+                image_analyzer.categorize_image(categories=self.model.categories, image_labels=image_labels)
+                for image_labels in image_labels_list
+            ]
+            
+        if settings.Classification.ENABLE_RESPONSE_CACHE:
+            for image_labels, category in zip(image_labels_list, categories):
+                _cache_put(self._category_cache_key(self.model.categories, image_labels), category)
+        return categories
+    
     def categorize_images(self, labeled_images: List[ImageBuckets.ImageInfo]) -> List[ImageBuckets.ImageInfo]:
-        image_analyzer = ImageAnalyzer()
+        image_analyzer = _shared_image_analyzer()
+        
+        # Cached answers first, the rest go to the LLM in batches of CATEGORIZE_BATCH_SIZE images
+        pending = []
+        for image in labeled_images:
+            if image.category:
+                # Already categorized from its filename
+                continue
+            # Plain dicts built directly - dataclasses.asdict deep-copies every field
+            image_labels = [{'score': label.score, 'description': label.description} for label in image.labels]
+            category = None
+            if settings.Classification.ENABLE_RESPONSE_CACHE:
+                category = _cache_get(self._category_cache_key(self.model.categories, image_labels))
+            if category is None:
+                pending.append((image, image_labels))
+            else:
+                image.category = category
+        
+        batch_size = settings.Classification.CATEGORIZE_BATCH_SIZE
+        batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+        
+        def categorize_batch_safe(batch) -> Optional[List[str]]:
+            try:
+                return self._categorize_batch(
+                    image_analyzer=image_analyzer,
+                    image_labels_list=[image_labels for _, image_labels in batch]
+                )
+            except Exception as exc:
+                logger.error(f"Images {[image.uri for image, _ in batch]} generated an exception: {exc}")
+                return None
         
-        # Use ThreadPoolExecutor for I/O-bound tasks
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            futures = {
-                executor.submit(
-                    image_analyzer.categorize_image,
-                    categories=self.model.categories, 
-                    image_labels=[label.model_dump() for label in image.labels]
-                ): image
-                for image in labeled_images
-            }
-
-            # Process results as they complete
-            for future in concurrent.futures.as_completed(futures):
-                image = futures[future]
-                try:
-                    result = future.result()
-                    image.category = result
-                except Exception as exc:
-                    logger.error(f"Image {image} generated an exception: {exc}")
+        # I/O-bound tasks on the shared pool
+        for batch, result in zip(batches, _api_executor.map(categorize_batch_safe, batches)):
+            if result is None:
+                continue
+            for (image, _), category in zip(batch, result):
+                image.category = category
                     
         return labeled_images
     
@@ -175,31 +408,35 @@ class ImageClassificationManager():
         # Initialize each category with an empty list of ImageBuckets.buckets
         buckets.buckets = {cat: [] for cat in categories}
 
+        categories_set = self._categories_set if categories is self.model.categories else frozenset(categories)
+
         def normalize_category(cat):
-            return cat if cat in categories else 'Other'
+            return cat if cat in categories_set else 'Other'
 
-        # Build up the ranking lists
+        # Sort all images once by descending score (stable), then deal them into their categories
+        # in that order - every bucket comes out ranked without a per-category sort
         for item in images:
             item.category = normalize_category(item.category)
-            # Use ImageBuckets.Item instead of a tuple
+            
+        for idx in BucketSoA.from_items(images).argsort_desc():
+            item = images[idx]
             buckets.buckets[item.category].append(
                 ImageBuckets.Item(uri=item.uri, score=item.score)
             )
 
-        # Sort each category's list by descending score
-        for cat in categories:
-            buckets.buckets[cat].sort(key=lambda r: r.score, reverse=True)
-
         return buckets
     
     def run_classification_for_project(self, user_id:str, project_id:str):
-        # Check if project exists using service layer
-        if not self.classification_service.project_service.project_exists(user_id, project_id):
-            logger.error(f"Unable to fetch project for user '{user_id}' and project '{project_id}'")
-            return
-        
         # Get session references for compatibility with existing storage operations
         _, project_ref, _ = self.session_manager.get_session_refs_by_ids(user_id=user_id, project_id=project_id)
+        
+        # One project read for the whole run - existence, excluded images and prior classification
+        project_doc = project_ref.get()
+        if not project_doc.exists:
+            logger.error(f"Unable to fetch project for user '{user_id}' and project '{project_id}'")
+            return
+        project_dict = project_doc.to_dict() or {}
+        excluded_images = project_dict.get('excluded_images', None)
             
         image_repos = StorageManager.get_image_repos_for_project(
             user_id=user_id,
@@ -211,23 +448,29 @@ class ImageClassificationManager():
         loaded_local_paths = []
         
         with TemporaryDirectory() as images_folder:
+            # Create every repo's subfolder up front, then download the repos concurrently
+            repo_subfolders = []
             for repo in image_repos:
-                cloud_path = CloudPath.from_path(repo)
-                subfolder_uuid = str(uuid.uuid4())
-                images_subfolder = os.path.join(images_folder, subfolder_uuid)
+                images_subfolder = os.path.join(images_folder, str(uuid.uuid4()))
                 os.makedirs(images_subfolder, exist_ok=True)
-
-                sub_l2c, sub_c2l = StorageManager.load_blobs(
-                    cloud_path=cloud_path, 
-                    dest_dir=images_subfolder,
-                    excluded_files=project_ref.get().to_dict().get('excluded_images', None)
+                repo_subfolders.append((CloudPath.from_path(repo), images_subfolder))
+
+            max_workers = max(1, min(len(repo_subfolders), settings.Classification.MAX_REPO_DOWNLOADS))
+            with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+                results = executor.map(
+                    lambda repo_subfolder: StorageManager.load_blobs(
+                        cloud_path=repo_subfolder[0], 
+                        dest_dir=repo_subfolder[1],
+                        excluded_files=excluded_images
+                    ),
+                    repo_subfolders
                 )
-                images_path_l2c_mapping.update(sub_l2c)
-                images_path_c2l_mapping.update(sub_c2l)
+                for sub_l2c, sub_c2l in results:
+                    images_path_l2c_mapping.update(sub_l2c)
+                    images_path_c2l_mapping.update(sub_c2l)
 
-            loaded_local_paths = [
-                str(file) for file in Path(images_folder).rglob("*") if file.is_file()
-            ]
+            # load_blobs maps exactly the files it downloaded - no need to walk the folder again
+            loaded_local_paths = list(images_path_l2c_mapping.keys())
             
             image_buckets_local = self.run_classification_for_files(
                 image_file_paths=loaded_local_paths
@@ -248,8 +491,8 @@ class ImageClassificationManager():
             # Store classification results using service layer
             IMAGE_CLASSIFICATION_KEY = settings.Classification.IMAGE_CLASSIFICATION_KEY
             
-            # Check if classification already exists
-            if self.classification_service.get_image_classification(user_id, project_id):
+            # Check if classification already exists (PostgreSQL projects keep it under the flattened 'classification' metadata)
+            if project_dict.get(IMAGE_CLASSIFICATION_KEY) or project_dict.get('classification', {}).get(IMAGE_CLASSIFICATION_KEY):
                 logger.info(f"Images are already classified for project '{project_id}'. Overwriting")
             else:
                 logger.debug(f"New image classification run for project '{project_id}'")
@@ -276,8 +519,8 @@ class ImageClassificationManager():
             categories=self.model.categories
         )
             
-        logger.debug("Image Classification Buckets:")
-        logger.debug(json.dumps(buckets.model_dump(), indent=2))
+        # Lazy - the dump is only built when a DEBUG sink is active
+        logger.opt(lazy=True).debug("Image Classification Buckets:\n{}", lambda: buckets.model_dump_json(indent=2))
         
         return buckets
     
@@ -291,7 +534,6 @@ class ImageClassificationManager():
         """
 
         categories = self.model.categories
-        interior_order = self.model.interior_order
         boundary_priorities = (
             self.model.boundary_priorities_small
             if num_clips < settings.Classification.MIN_CLIPS_IN_LARGE_MOVIE
@@ -300,7 +542,7 @@ class ImageClassificationManager():
 
         # Validate categories
         for cat in buckets.buckets:
-            if cat not in categories:
+            if cat not in self._categories_set:
                 raise ValueError(f"Invalid category '{cat}' found in image_info. Valid categories are: {categories}")
 
         # Sort images within each category by descending score
@@ -321,40 +563,79 @@ class ImageClassificationManager():
             # No images available
             return ImageSequence(sequence=[])
 
-        # Define fallback categories (not in interior_order)
-        fallback_categories = [cat for cat in categories if cat not in interior_order]
+        # Fallback categories (not in interior_order) are precomputed with the model
+        fallback_categories = self._fallback_categories
 
-        # Make a mutable copy of interior_order to allow cycling
-        current_interior_order = interior_order.copy()
+        # Mutable copy of interior_order to allow O(1) cycling
+        current_interior_order = deque(self._interior_order)
 
         # Set to track used categories for boundary clip fallbacks
         fallback_used_categories = set()
 
-        def weighted_random_choice(items: List[ImageBuckets.Item]) -> ImageBuckets.Item:
+        # Per-category weight trees kept in step with the buckets, so a pick is an O(log k) draw plus
+        # a swap-pop instead of rebuilding the whole category list and its weights
+        bucket_weights = {cat: _WeightedBucket([ri.score for ri in items]) for cat, items in buckets.buckets.items()}
+        # Categories that still have images, maintained on every removal so fallbacks skip empty buckets
+        nonempty_cats = {cat for cat, items in buckets.buckets.items() if items}
+
+        def remove_from_category(cat: str, idx: int) -> ImageBuckets.Item:
             """
-            Select an item using weighted randomness based on score.
-            
-            Returns ImageBuckets.Item or None if empty.
+            Remove and return the item at `idx` of a category (order within a bucket is not kept).
             """
+            items = buckets.buckets[cat]
+            chosen = items[idx]
+            items[idx] = items[-1]
+            items.pop()
+            bucket_weights[cat].pop(idx)
             if not items:
-                return None
-            scores = [ri.score for ri in items]
-            chosen = random.choices(items, weights=scores, k=1)[0]
+                nonempty_cats.discard(cat)
             return chosen
 
+        def weighted_random_choice_idx(cat: str) -> Optional[int]:
+            """
+            Select an index of a category using weighted randomness based on score.
+            
+            Returns the index or None if empty.
+            """
+            if not buckets.buckets.get(cat):
+                return None
+            return bucket_weights[cat].sample(self._rng)
+
+        def pick_weighted_from_categories(cats) -> Optional[tuple[str, ImageBuckets.Item]]:
+            """
+            Weighted pick across several categories. Returns (category, item) with the item removed, or None.
+            """
+            # One draw over the category totals picks the bucket, the remainder is resolved inside
+            # that bucket's tree - O(K + log k) without materializing any candidate list
+            cats = [cat for cat in cats if cat in nonempty_cats]
+            if not cats:
+                return None
+            grand_total = sum(bucket_weights[cat].total for cat in cats)
+            if grand_total <= 0:
+                raise ValueError('Total of weights must be greater than zero')
+            target = self._rng.uniform(0, grand_total)
+            for chosen_cat in cats:
+                cat_total = bucket_weights[chosen_cat].total
+                if target < cat_total:
+                    break
+                target -= cat_total
+            # Float round-off can leave target at the last bucket's total - clamp to its last item
+            idx = min(bucket_weights[chosen_cat].find(target), len(buckets.buckets[chosen_cat]) - 1)
+            return chosen_cat, remove_from_category(chosen_cat, idx)
+
         def pick_image_from_category(cat: str) -> ImageBuckets.ImageInfo:
             """
             Pick an image from a specific category using weighted randomness.
             
             Returns ImageBuckets.ImageInfo or None
             """
-            if cat not in buckets.buckets or not buckets.buckets[cat]:
+            if cat not in nonempty_cats:
                 return None
-            chosen = weighted_random_choice(buckets.buckets[cat])
-            if not chosen:
+            idx = weighted_random_choice_idx(cat)
+            if idx is None:
                 return None
             # Remove the chosen image to prevent repetition
-            buckets.buckets[cat] = [ri for ri in buckets.buckets[cat] if ri.uri != chosen.uri]
+            chosen = remove_from_category(cat, idx)
             return ImageBuckets.ImageInfo(
                 category=cat,
                 uri=chosen.uri,
@@ -368,8 +649,7 @@ class ImageClassificationManager():
                 for ri in bucket_items:
                     all_images.append((cat, ri.uri, ri.score))
                         
-            all_images_sorted = sorted(all_images, key=lambda x: x[1].split('/')[-1])
-            zero_cat, zero_uri, zero_score = all_images_sorted[0]
+            zero_cat, zero_uri, zero_score = min(all_images, key=lambda x: x[1].rsplit('/', 1)[-1])
             if zero_cat == 'Exterior':
                 return zero_cat, zero_uri, zero_score
             else: #Default to hero shot
@@ -406,20 +686,10 @@ class ImageClassificationManager():
                     )
 
             # Fallback to any unused category
-            not_used_candidates = []
-            for c, bucket_items in buckets.buckets.items():
-                if c not in fallback_used_categories and bucket_items:
-                    for ri in bucket_items:
-                        not_used_candidates.append((c, ri.uri, ri.score))
-
-            if not_used_candidates:
-                chosen_cat, chosen_uri, chosen_score = random.choices(
-                    not_used_candidates, 
-                    weights=[s for _, _, s in not_used_candidates], 
-                    k=1
-                )[0]
-                # Remove the chosen image
-                buckets.buckets[chosen_cat] = [ri for ri in buckets.buckets[chosen_cat] if ri.uri != chosen_uri]
+            picked = pick_weighted_from_categories(nonempty_cats - fallback_used_categories)
+            if picked:
+                chosen_cat, chosen = picked
+                chosen_uri, chosen_score = chosen.uri, chosen.score
                 fallback_used_categories.add(chosen_cat)
                 rationale = f"Selected boundary clip image (fallback unused category, clip {clip_idx})."
                 return ImageSequence.ImageInfo(
@@ -430,18 +700,10 @@ class ImageClassificationManager():
                 )
 
             # Final fallback to any available category
-            all_candidates = []
-            for cat, bucket_items in buckets.buckets.items():
-                for ri in bucket_items:
-                    all_candidates.append((cat, ri.uri, ri.score))
-            if all_candidates:
-                chosen_cat, chosen_uri, chosen_score = random.choices(
-                    all_candidates, 
-                    weights=[s for _, _, s in all_candidates], 
-                    k=1
-                )[0]
-                # Remove the chosen image
-                buckets.buckets[chosen_cat] = [ri for ri in buckets.buckets[chosen_cat] if ri.uri != chosen_uri]
+            picked = pick_weighted_from_categories(nonempty_cats)
+            if picked:
+                chosen_cat, chosen = picked
+                chosen_uri, chosen_score = chosen.uri, chosen.score
                 rationale = f"Selected boundary clip image (final fallback any category, clip {clip_idx})"
                 return ImageSequence.ImageInfo(
                     uri=chosen_uri,
@@ -460,11 +722,11 @@ class ImageClassificationManager():
             # Cycle through the current_interior_order
             for _ in range(len(current_interior_order)):
                 cat = current_interior_order[0]
-                if buckets.buckets.get(cat):
+                if cat in nonempty_cats:
                     image_info = pick_image_from_category(cat)
                     if image_info and image_info.uri:
                         rationale = f"Selected interior clip image (clip {clip_idx}) from '{cat}'"
-                        current_interior_order.append(current_interior_order.pop(0))
+                        current_interior_order.rotate(-1)
                         return ImageSequence.ImageInfo(
                             uri=image_info.uri,
                             category=image_info.category,
@@ -472,22 +734,13 @@ class ImageClassificationManager():
                             score=image_info.score
                         )
                 # Move the category to the end if no images are available
-                current_interior_order.append(current_interior_order.pop(0))
+                current_interior_order.rotate(-1)
 
             # If no images available in interior_order, fallback to other categories
-            fallback_candidates = []
-            for cat in fallback_categories:
-                if buckets.buckets.get(cat):
-                    for ri in buckets.buckets[cat]:
-                        fallback_candidates.append((cat, ri.uri, ri.score))
-            if fallback_candidates:
-                chosen_cat, chosen_uri, chosen_score = random.choices(
-                    fallback_candidates, 
-                    weights=[s for _, _, s in fallback_candidates], 
-                    k=1
-                )[0]
-                # Remove the chosen image
-                buckets.buckets[chosen_cat] = [ri for ri in buckets.buckets[chosen_cat] if ri.uri != chosen_uri]
+            picked = pick_weighted_from_categories(fallback_categories)
+            if picked:
+                chosen_cat, chosen = picked
+                chosen_uri, chosen_score = chosen.uri, chosen.score
                 rationale = f"Selected interior clip image (clip {clip_idx}) from fallback category '{chosen_cat}'"
                 return ImageSequence.ImageInfo(
                     uri=chosen_uri,
@@ -497,17 +750,10 @@ class ImageClassificationManager():
                 )
 
             # Final fallback to any available category
-            all_candidates = []
-            for cat, bucket_items in buckets.buckets.items():
-                for ri in bucket_items:
-                    all_candidates.append((cat, ri.uri, ri.score))
-            if all_candidates:
-                chosen_cat, chosen_uri, chosen_score = random.choices(
-                    all_candidates, 
-                    weights=[s for _, _, s in all_candidates], 
-                    k=1
-                )[0]
-                buckets.buckets[chosen_cat] = [ri for ri in buckets.buckets[chosen_cat] if ri.uri != chosen_uri]
+            picked = pick_weighted_from_categories(nonempty_cats)
+            if picked:
+                chosen_cat, chosen = picked
+                chosen_uri, chosen_score = chosen.uri, chosen.score
                 rationale = f"Selected interior clip image (clip {clip_idx}) from any available category '{chosen_cat}'"
                 return ImageSequence.ImageInfo(
                     uri=chosen_uri,
@@ -531,9 +777,8 @@ class ImageClassificationManager():
             
             if all_images:
                 if self.model.hero_selection == HeroSelectionEnum.FILENAME:
-                    # Sort by filename
-                    all_images_sorted = sorted(all_images, key=lambda x: x[1].split('/')[-1])
-                    hero_cat, hero_uri, hero_score = all_images_sorted[0]
+                    # First by filename - min is O(N), no need to sort everything to take the head
+                    hero_cat, hero_uri, hero_score = min(all_images, key=lambda x: x[1].rsplit('/', 1)[-1])
                 elif self.model.hero_selection == HeroSelectionEnum.HIGH_SCORE:
                     # Highest score
                     hero_cat, hero_uri, hero_score = max(all_images, key=lambda x: x[2])
@@ -542,8 +787,10 @@ class ImageClassificationManager():
                 else:
                     raise ValueError("Invalid hero_selection criteria.")
                 
-                # Remove the hero image from buckets
-                buckets.buckets[hero_cat] = [ri for ri in buckets.buckets[hero_cat] if ri.uri != hero_uri]
+                # Remove the hero image from buckets (already gone if the custom selector picked it)
+                hero_idx = next((idx for idx, ri in enumerate(buckets.buckets[hero_cat]) if ri.uri == hero_uri), None)
+                if hero_idx is not None:
+                    remove_from_category(hero_cat, hero_idx)
                 # Add hero image to the sequence
                 hero_rationale = "Selected hero image"
                 image_sequence.sequence.append(ImageSequence.ImageInfo(
@@ -586,13 +833,18 @@ class ImageClassificationManager():
         try:
             if verbose:
                 logger.info(f'Selecting {num_clips} images')
-            image_sequence = self.gen_sequence(num_clips=num_clips, buckets=buckets.model_copy(deep=True))
+            # gen_sequence only reorders/pops the per-category lists and Items are frozen, so fresh
+            # lists around the same Items isolate the caller without a deep copy or re-validation
+            selection_buckets = ImageBuckets.model_construct(
+                buckets={cat: list(items) for cat, items in buckets.buckets.items()}
+            )
+            image_sequence = self.gen_sequence(num_clips=num_clips, buckets=selection_buckets)
         except Exception as e:
             logger.exception(f'Unable to select images to make movie. Reason: {e}')
         
         if image_sequence:
             if verbose:
-                logger.debug(f'\n{image_sequence.model_dump_json(indent=2)}')
+                logger.opt(lazy=True).debug('\n{}', lambda: image_sequence.model_dump_json(indent=2))
             return [image_info.uri for image_info in image_sequence.sequence]
         else:
             logger.error('Failed to classify and pick images. Fallback: pick in lexicographic order')
@@ -4,15 +4,19 @@ Integrates Google Video Intelligence API + Google Vision API with ADR-002 optimi
 """
 
 import os
+import re
 import json
 import time
+import hashlib
 import tempfile
-import subprocess
-import statistics
 from typing import List, Dict, Any, Optional, Tuple
 from collections import defaultdict
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
+import cv2
+import numpy as np
 from google.cloud import videointelligence_v1 as videointelligence
 from google.cloud import vision_v1 as vision
 from google.cloud import storage
@@ -25,6 +29,100 @@ from classification.image_classification_manager import ImageClassificationManag
 from classification.types.media_models import VideoMedia
 from gcp.storage import StorageManager
 
+VISION_BATCH_SIZE = 16  # Max images per Vision API batch_annotate_images request
+VISION_BATCH_MAX_BYTES = 8 * 1024 * 1024  # Inline image bytes per batch request, under the API's 10 MB request limit
+VIDEO_INTELLIGENCE_POLL_INTERVAL = 1.0  # Seconds between polls of pending Video Intelligence operations
+
+# ADR-002 filtering categories
+_SPECIFIC_SCENE_KEYWORDS = frozenset({
+    'bedroom', 'bathroom', 'kitchen', 'living room', 'dining room', 'office', 
+    'hallway', 'corridor', 'lobby', 'entrance', 'foyer', 'balcony', 'patio',
+    'garden', 'yard', 'outdoor', 'pool', 'swimming pool', 'swimming', 'deck', 
+    'terrace', 'garage', 'closet', 'pantry', 'basement', 'attic'
+})
+_GENERIC_SCENE_KEYWORDS = frozenset({
+    'room', 'interior', 'space', 'area', 'zone', 'chamber', 'suite', 'studio', 'loft'
+})
+_EXCLUDED_GENERIC_LABELS = frozenset({
+    'floor', 'property', 'wall', 'flooring', 'furniture', 'table', 'chair', 
+    'ceiling', 'tile', 'wood', 'stone', 'countertop', 'cabinet', 'door', 'window'
+})
+_SPECIFIC_SCENE_RELATED_KEYWORDS = frozenset({
+    'bedroom', 'bathroom', 'kitchen', 'living room', 'dining room', 'office', 
+    'outdoor', 'pool', 'swimming pool', 'patio', 'balcony', 'garage'
+})
+
+def _keyword_regex(keywords) -> re.Pattern:
+    # Substring semantics, same as `any(keyword in description ...)`, in one scan of the description
+    return re.compile('|'.join(map(re.escape, sorted(keywords, key=len, reverse=True))))
+
+_SPECIFIC_SCENE_RE = _keyword_regex(_SPECIFIC_SCENE_KEYWORDS)
+_GENERIC_SCENE_RE = _keyword_regex(_GENERIC_SCENE_KEYWORDS)
+_EXCLUDED_GENERIC_RE = _keyword_regex(_EXCLUDED_GENERIC_LABELS)
+_SPECIFIC_SCENE_RELATED_RE = _keyword_regex(_SPECIFIC_SCENE_RELATED_KEYWORDS)
+
+def _adr002_rule(description_lower: str) -> Optional[Tuple[float, int]]:
+    """
+    ADR-002 (min confidence, priority) for a label - 1 = specific scene, 2 = generic scene,
+    3 = excluded generic at extremely high confidence. The thresholds rise with the priority, so
+    the first rule the label qualifies for decides for all its frames; None drops the label
+    """
+    if _SPECIFIC_SCENE_RE.search(description_lower):
+        return 0.6, 1
+    if _EXCLUDED_GENERIC_RE.search(description_lower):
+        return 0.95, 3
+    if _GENERIC_SCENE_RE.search(description_lower):
+        return 0.8, 2
+    return None
+
+# ADR-002 optimized Video Intelligence configuration
+_VIDEO_INTELLIGENCE_FEATURES = [videointelligence.Feature.LABEL_DETECTION, videointelligence.Feature.SHOT_CHANGE_DETECTION]
+_VIDEO_INTELLIGENCE_CONTEXT = {
+    "label_detection_config": {
+        "label_detection_mode": videointelligence.LabelDetectionMode.SHOT_AND_FRAME_MODE,
+        "model": "builtin/stable",
+        "frame_confidence_threshold": 0.7,   # Balanced for temporal evidence
+        "video_confidence_threshold": 0.6    # Inclusive for complex scenes
+    },
+    "shot_change_detection_config": {
+        "model": "builtin/stable"
+    }
+}
+
+# Scene types outside the model's categories map onto these, anything else is 'Other'
+_SCENE_CATEGORY_MAPPING = {
+    'living room': 'Interior',
+    'kitchen': 'Interior', 
+    'bedroom': 'Interior',
+    'bathroom': 'Interior',
+    'dining room': 'Interior',
+    'office': 'Interior',
+    'outdoor': 'Exterior',
+    'pool': 'Exterior',
+    'swimming pool': 'Exterior',
+    'patio': 'Exterior',
+    'balcony': 'Exterior'
+}
+
+
+class FrameLabelsSoA():
+    """
+    Struct-of-arrays view of Video Intelligence frame labels - one slot per labeled frame in
+    parallel `entity_idx`/`confidences`/`time_offsets`/`priorities` arrays, with the label text
+    stored once per entity in `descriptions`, so windowing is array operations
+    """
+    __slots__ = ('descriptions', 'entity_idx', 'confidences', 'time_offsets', 'priorities')
+    
+    def __init__(self, descriptions:list[str], entity_idx:np.ndarray, confidences:np.ndarray,
+                 time_offsets:np.ndarray, priorities:np.ndarray):
+        self.descriptions = descriptions
+        self.entity_idx = entity_idx
+        self.confidences = confidences
+        self.time_offsets = time_offsets
+        self.priorities = priorities
+        
+    def __len__(self) -> int:
+        return len(self.entity_idx)
 
 class VideoClassificationManager:
     """
@@ -50,19 +148,31 @@ class VideoClassificationManager:
         )
         self.vision_client = vision.ImageAnnotatorClient(credentials=self.credentials)
         self.storage_client = storage.Client(credentials=self.credentials)
+        # Keyframe uploads are independent network-bound PUTs - one long-lived pool overlaps them
+        self._upload_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix='keyframe-upload')
         
         # Initialize existing image classifier for category consistency
         self.image_classifier = ClassificationManager()
         self.model = self.image_classifier.model  # Reuse same categories as images
         
-        # Load enhanced room mapping
+        # Load enhanced room mapping, lowercased once for the per-label matching loops
         self.room_mapping = self._load_room_mapping()
+        self._room_types_lc = tuple((room_type, room_type.lower()) for room_type in self.room_mapping)
+        # Flat (indicator, room type) index, in mapping order, instead of nested per-room loops
+        self._indicator_rooms_lc = tuple(
+            (indicator.lower(), room_type)
+            for room_type, room_indicators in self.room_mapping.items()
+            for indicator in room_indicators
+        )
+        # Keyframes keep returning the same labels, so room matching is memoized per description
+        self._room_matches = lru_cache(maxsize=1024)(self._match_description_to_rooms)
         
         logger.info("[VIDEO_CLASSIFIER] Consolidated video classification manager initialized")
     
     def _load_room_mapping(self) -> Dict[str, List[str]]:
         """Load the enhanced room mapping from JSON file"""
-        mapping_path = Path(__file__).parent.parent / "utils" / "video_classification_room_mapping.json"
+        # The mapping lives in src/utils, two levels up from src/classification/legacy
+        mapping_path = Path(__file__).parents[2] / "utils" / "video_classification_room_mapping.json"
         
         try:
             with open(mapping_path, 'r') as f:
@@ -103,52 +213,63 @@ class VideoClassificationManager:
             "processing_time": 0.0
         }
         
+        # One temp dir for the keyframes of every video in this call
+        temp_dir = tempfile.TemporaryDirectory()
         try:
+            # Step 1: Submit every video to Google Video Intelligence API (ADR-002 config) up front -
+            # the operations run server-side in parallel and are processed as they complete
+            pending = []
             for video in videos:
-                logger.info(f"[VIDEO_CLASSIFIER] Processing video: {video.uri}")
-                video_start_time = time.time()
-                
-                # Step 1: Analyze video with Google Video Intelligence API (ADR-002 config)
-                raw_scenes = self._analyze_with_video_intelligence(video.uri)
-                if not raw_scenes:
-                    logger.warning(f"[VIDEO_CLASSIFIER] No scenes detected for video: {video.uri}")
-                    continue
-                
-                # Step 2: Apply ADR-002 intelligent filtering and consolidation
-                filtered_scenes = self._apply_adr002_filtering(raw_scenes)
-                consolidated_scenes = self._consolidate_scenes_by_time_windows(filtered_scenes, video.duration or 0)
-                
-                if not consolidated_scenes:
-                    logger.warning(f"[VIDEO_CLASSIFIER] No scenes survived filtering for video: {video.uri}")
-                    continue
-                
-                # Step 3: Extract keyframes for top scenes (cost control)
-                scenes_with_keyframes = self._extract_keyframes_for_scenes(
-                    video.uri, consolidated_scenes, user_id, project_id
-                )
-                
-                # Step 4: Analyze keyframes with Google Vision API
-                vision_enhanced_scenes = self._analyze_keyframes_with_vision(scenes_with_keyframes)
-                
-                # Step 5: Apply hybrid classification rules and create scene buckets
-                final_scenes = self._apply_hybrid_classification_rules(vision_enhanced_scenes)
-                self._add_scenes_to_buckets(video_buckets, final_scenes, video.uri)
-                
-                # Update processing summary
-                processing_summary["total_videos_processed"] += 1
-                processing_summary["total_scenes_detected"] += len(final_scenes)
-                processing_summary["keyframes_extracted"] += len(scenes_with_keyframes)
-                processing_summary["vision_api_calls"] += len(scenes_with_keyframes)
-                processing_summary["scenes_refined_by_vision"] += len([s for s in final_scenes if s.get("detection_source") == "vision_api"])
-                processing_summary["cost_estimate"] += len(scenes_with_keyframes) * 0.0015  # $1.50 per 1000 images
+                operation = self._submit_video_intelligence(video.uri)
+                if operation is not None:
+                    pending.append((video, operation, time.time()))
+            
+            # Steps 2-5 run on a pool as each operation completes, so one video's keyframe and Vision
+            # round trips overlap the others' while this thread keeps polling
+            video_futures = {}
+            with ThreadPoolExecutor(
+                max_workers=settings.Classification.MAX_CONCURRENT_VIDEOS, thread_name_prefix='video-scenes'
+            ) as video_pool:
+                while pending:
+                    # Operations past the 10 minute budget are collected too - result() then times out
+                    ready = next(
+                        (i for i, (_, operation, submitted_at) in enumerate(pending)
+                         if operation.done() or time.time() - submitted_at > 600),
+                        None
+                    )
+                    if ready is None:
+                        time.sleep(VIDEO_INTELLIGENCE_POLL_INTERVAL)
+                        continue
+                    
+                    video, operation, video_start_time = pending.pop(ready)
+                    future = video_pool.submit(
+                        self._process_video, video, operation, user_id, project_id, Path(temp_dir.name)
+                    )
+                    video_futures[future] = (video, video_start_time)
                 
-                video_processing_time = time.time() - video_start_time
-                logger.info(f"[VIDEO_CLASSIFIER] Processed video in {video_processing_time:.2f}s with {len(final_scenes)} scenes")
+                # Buckets and summary are only touched from this thread
+                for future in as_completed(video_futures):
+                    video, video_start_time = video_futures[future]
+                    processed = future.result()
+                    if processed is None:
+                        continue
+                    final_scenes, scenes_with_keyframes = processed
+                    self._add_scenes_to_buckets(video_buckets, final_scenes, video.uri)
+                    
+                    # Update processing summary
+                    processing_summary["total_videos_processed"] += 1
+                    processing_summary["total_scenes_detected"] += len(final_scenes)
+                    processing_summary["keyframes_extracted"] += len(scenes_with_keyframes)
+                    processing_summary["vision_api_calls"] += len(scenes_with_keyframes)
+                    processing_summary["scenes_refined_by_vision"] += len([s for s in final_scenes if s.get("detection_source") == "vision_api"])
+                    processing_summary["cost_estimate"] += len(scenes_with_keyframes) * 0.0015  # $1.50 per 1000 images
+                    
+                    video_processing_time = time.time() - video_start_time
+                    logger.info(f"[VIDEO_CLASSIFIER] Processed video in {video_processing_time:.2f}s with {len(final_scenes)} scenes")
             
             # Finalize results
             processing_summary["processing_time"] = time.time() - start_time
             video_buckets.processing_summary = processing_summary
-            video_buckets.total_scenes = sum(len(scenes) for scenes in video_buckets.buckets.values())
             video_buckets.sort_scenes_by_confidence()
             
             logger.success(f"[VIDEO_CLASSIFIER] Consolidated classification completed: "
@@ -162,8 +283,43 @@ class VideoClassificationManager:
             # Return empty buckets with error info
             video_buckets.processing_summary = {**processing_summary, "error": str(e)}
             return video_buckets
+        
+        finally:
+            temp_dir.cleanup()
     
-    def _analyze_with_video_intelligence(self, video_uri: str) -> List[Dict[str, Any]]:
+    def _process_video(self, video: VideoMedia, operation, user_id: str, project_id: str,
+                       temp_dir_path: Path) -> Optional[Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]]:
+        """
+        Steps 2-5 for a video whose Video Intelligence operation is done
+        
+        Returns:
+            The final scenes and the scenes with keyframes, None if no scene survived
+        """
+        logger.info(f"[VIDEO_CLASSIFIER] Processing video: {video.uri}")
+        
+        # Step 2: ADR-002 intelligent filtering (applied while the frames are read) and consolidation
+        filtered_scenes = self._collect_video_intelligence(video.uri, operation)
+        if filtered_scenes is None:
+            logger.warning(f"[VIDEO_CLASSIFIER] No scenes detected for video: {video.uri}")
+            return None
+        
+        consolidated_scenes = self._consolidate_scenes_by_time_windows(filtered_scenes, video.duration or 0)
+        
+        if not consolidated_scenes:
+            logger.warning(f"[VIDEO_CLASSIFIER] No scenes survived filtering for video: {video.uri}")
+            return None
+        
+        # Steps 3 & 4: Extract keyframes for top scenes (cost control) and analyze them with
+        # Google Vision API - labeling overlaps with the keyframe uploads
+        scenes_with_keyframes = self._extract_keyframes_for_scenes(
+            video.uri, consolidated_scenes, user_id, project_id, temp_dir_path
+        )
+        
+        # Step 5: Apply hybrid classification rules
+        final_scenes = self._apply_hybrid_classification_rules(scenes_with_keyframes)
+        return final_scenes, scenes_with_keyframes
+    
+    def _analyze_with_video_intelligence(self, video_uri: str) -> Optional[FrameLabelsSoA]:
         """
         Analyze video with Google Video Intelligence API using ADR-002 optimized configuration
         
@@ -171,176 +327,141 @@ class VideoClassificationManager:
             video_uri: GCS URI of the video to analyze
             
         Returns:
-            List of raw scene data from Video Intelligence API
+            ADR-002 filtered frame labels from Video Intelligence API, None if the analysis failed
         """
+        operation = self._submit_video_intelligence(video_uri)
+        if operation is None:
+            return None
+        return self._collect_video_intelligence(video_uri, operation)
+    
+    def _submit_video_intelligence(self, video_uri: str):
+        """Start the Video Intelligence long-running operation for a video without waiting on it"""
         logger.info(f"[VIDEO_CLASSIFIER] Analyzing video with Video Intelligence API: {video_uri}")
         
-        # ADR-002 optimized configuration
-        config = {
-            "use_label_detection": True,
-            "label_detection_mode": "SHOT_AND_FRAME_MODE",
-            "model": "builtin/stable",
-            "video_confidence_threshold": 0.6,   # Inclusive for complex scenes
-            "frame_confidence_threshold": 0.7,   # Balanced for temporal evidence
-            "use_shot_detection": True,
-            "shot_detection_model": "builtin/stable"
-        }
-        
         try:
-            # Configure Video Intelligence API request
-            features = [videointelligence.Feature.LABEL_DETECTION, videointelligence.Feature.SHOT_CHANGE_DETECTION]
-            
-            video_context = {
-                "label_detection_config": {
-                    "label_detection_mode": getattr(videointelligence.LabelDetectionMode, config["label_detection_mode"]),
-                    "model": config["model"],
-                    "frame_confidence_threshold": config["frame_confidence_threshold"],
-                    "video_confidence_threshold": config["video_confidence_threshold"]
-                },
-                "shot_change_detection_config": {
-                    "model": config["shot_detection_model"]
-                }
-            }
-            
             # Make API request
-            operation = self.video_intelligence_client.annotate_video(
+            return self.video_intelligence_client.annotate_video(
                 request={
                     "input_uri": video_uri,
-                    "features": features,
-                    "video_context": video_context
+                    "features": _VIDEO_INTELLIGENCE_FEATURES,
+                    "video_context": _VIDEO_INTELLIGENCE_CONTEXT
                 }
             )
-            
+        
+        except Exception as e:
+            logger.error(f"[VIDEO_CLASSIFIER] Video Intelligence API submission failed: {e}")
+            return None
+    
+    def _collect_video_intelligence(self, video_uri: str, operation) -> Optional[FrameLabelsSoA]:
+        """
+        Extract scene data from a Video Intelligence operation, applying ADR-002 intelligent label
+        filtering and prioritization as the frames are read
+        """
+        try:
             logger.info(f"[VIDEO_CLASSIFIER] Processing video with Video Intelligence API...")
-            result = operation.result(timeout=600)  # 10 minute timeout
-            
-            # Extract raw scene data
-            raw_scenes = []
+            result = operation.result(timeout=1)  # Already done, or past its 10 minute budget
+            
+            # Extract filtered scene data - one entry per kept label entity, one array slot per kept frame
+            descriptions = []
+            entity_idx = []
+            confidences = []
+            time_offsets = []
+            priorities = []
+            raw_count = 0
             for annotation_result in result.annotation_results:
                 # Process frame labels for scene detection
-                if annotation_result.frame_label_annotations:
-                    for label_annotation in annotation_result.frame_label_annotations:
-                        for frame in label_annotation.frames:
-                            time_offset = frame.time_offset.seconds + frame.time_offset.microseconds / 1e6
-                            raw_scenes.append({
-                                "description": label_annotation.entity.description,
-                                "confidence": frame.confidence,
-                                "time_offset": time_offset,
-                                "entity_id": label_annotation.entity.entity_id
-                            })
+                for label_annotation in annotation_result.frame_label_annotations:
+                    raw_count += len(label_annotation.frames)
+                    rule = _adr002_rule(label_annotation.entity.description.lower())
+                    if rule is None:
+                        continue
+                    
+                    min_confidence, priority = rule
+                    idx = len(descriptions)
+                    descriptions.append(label_annotation.entity.description)
+                    for frame in label_annotation.frames:
+                        if frame.confidence >= min_confidence:
+                            entity_idx.append(idx)
+                            confidences.append(frame.confidence)
+                            time_offsets.append(frame.time_offset.seconds + frame.time_offset.microseconds / 1e6)
+                            priorities.append(priority)
+            
+            filtered_scenes = FrameLabelsSoA(
+                descriptions=descriptions,
+                entity_idx=np.array(entity_idx, dtype=np.int32),
+                confidences=np.array(confidences, dtype=np.float32),
+                time_offsets=np.array(time_offsets, dtype=np.float64),
+                priorities=np.array(priorities, dtype=np.int8)
+            )
             
-            logger.info(f"[VIDEO_CLASSIFIER] Video Intelligence API detected {len(raw_scenes)} raw scene labels")
-            return raw_scenes
+            logger.info(f"[VIDEO_CLASSIFIER] Video Intelligence API detected {raw_count} raw scene labels")
+            logger.debug(f"[VIDEO_CLASSIFIER] ADR-002 filtering: {raw_count} → {len(filtered_scenes)} scenes")
+            return filtered_scenes
             
         except Exception as e:
             logger.error(f"[VIDEO_CLASSIFIER] Video Intelligence API analysis failed: {e}")
-            return []
-    
-    def _apply_adr002_filtering(self, raw_scenes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Apply ADR-002 intelligent label filtering and prioritization"""
-        logger.debug(f"[VIDEO_CLASSIFIER] Applying ADR-002 filtering to {len(raw_scenes)} raw scenes")
-        
-        # ADR-002 filtering categories
-        specific_scene_keywords = {
-            'bedroom', 'bathroom', 'kitchen', 'living room', 'dining room', 'office', 
-            'hallway', 'corridor', 'lobby', 'entrance', 'foyer', 'balcony', 'patio',
-            'garden', 'yard', 'outdoor', 'pool', 'swimming pool', 'swimming', 'deck', 
-            'terrace', 'garage', 'closet', 'pantry', 'basement', 'attic'
-        }
-        
-        generic_scene_keywords = {
-            'room', 'interior', 'space', 'area', 'zone', 'chamber', 'suite', 'studio', 'loft'
-        }
-        
-        excluded_generic_labels = {
-            'floor', 'property', 'wall', 'flooring', 'furniture', 'table', 'chair', 
-            'ceiling', 'tile', 'wood', 'stone', 'countertop', 'cabinet', 'door', 'window'
-        }
-        
-        filtered_scenes = []
-        for scene in raw_scenes:
-            description_lower = scene['description'].lower()
-            confidence = scene['confidence']
-            
-            # Apply filtering logic
-            is_specific_scene = any(keyword in description_lower for keyword in specific_scene_keywords)
-            is_generic_scene = any(keyword in description_lower for keyword in generic_scene_keywords)
-            is_excluded_generic = any(keyword in description_lower for keyword in excluded_generic_labels)
-            
-            should_include = False
-            priority = 3  # Default low priority
-            
-            if is_specific_scene and confidence >= 0.6:
-                should_include = True
-                priority = 1  # Highest priority
-            elif is_generic_scene and confidence >= 0.8 and not is_excluded_generic:
-                should_include = True
-                priority = 2  # Medium priority
-            elif is_excluded_generic and confidence >= 0.95:
-                should_include = True
-                priority = 3  # Low priority (only for extremely high confidence)
-            
-            if should_include:
-                scene['priority'] = priority
-                scene['filter_reason'] = 'specific_scene' if priority == 1 else 'generic_scene' if priority == 2 else 'high_confidence_generic'
-                filtered_scenes.append(scene)
-        
-        logger.debug(f"[VIDEO_CLASSIFIER] ADR-002 filtering: {len(raw_scenes)} → {len(filtered_scenes)} scenes")
-        return filtered_scenes
+            return None
     
-    def _consolidate_scenes_by_time_windows(self, filtered_scenes: List[Dict[str, Any]], video_duration: float) -> List[Dict[str, Any]]:
+    def _consolidate_scenes_by_time_windows(self, filtered_scenes: FrameLabelsSoA, video_duration: float) -> List[Dict[str, Any]]:
         """Apply ADR-002 time-window consolidation with priority resolution"""
         if not filtered_scenes:
             return []
         
         logger.debug(f"[VIDEO_CLASSIFIER] Consolidating {len(filtered_scenes)} scenes by time windows")
         
-        # Group scenes by 1-second time windows
-        time_windows = defaultdict(list)
-        for scene in filtered_scenes:
-            time_key = int(scene['time_offset'])
-            time_windows[time_key].append(scene)
-        
-        # For each time window, select the best scene indicator (priority resolution)
-        consolidated_frames = []
-        for time_key, scenes_at_time in time_windows.items():
-            # Sort by priority (1 = specific scene first) then by confidence
-            scenes_at_time.sort(key=lambda x: (x['priority'], -x['confidence']))
-            best_scene = scenes_at_time[0]  # Take highest priority scene
-            consolidated_frames.append(best_scene)
+        # Group scenes by 1-second time windows and select the best scene indicator of each
+        # (priority resolution) - a per-window argmin, no sorting. Priority (1 = specific scene
+        # first) then confidence is ranked as priority * 2 - confidence, exact in float64
+        time_keys = filtered_scenes.time_offsets.astype(np.int64)
+        windows = time_keys - time_keys.min()
+        n_frames, n_windows = len(filtered_scenes), int(windows.max()) + 1
+        rank = filtered_scenes.priorities.astype(np.float64) * 2 - filtered_scenes.confidences
+        
+        best_rank = np.full(n_windows, np.inf)
+        np.minimum.at(best_rank, windows, rank)
+        # Ties go to the earliest frame, the first one seen in the window
+        candidates = np.flatnonzero(rank == best_rank[windows])
+        best_frames = np.full(n_windows, n_frames)
+        np.minimum.at(best_frames, windows[candidates], candidates)
+        first_seen = np.full(n_windows, n_frames)
+        np.minimum.at(first_seen, windows, np.arange(n_frames))
+        
+        # Windows in order of first appearance, like the frames they came from
+        occupied = np.flatnonzero(first_seen < n_frames)
+        best_frames = best_frames[occupied[np.argsort(first_seen[occupied], kind='stable')]]
         
         # Group consolidated frames by scene description
         scene_groups = defaultdict(list)
-        for frame in consolidated_frames:
-            scene_groups[frame['description']].append(frame)
+        for frame_idx in best_frames.tolist():
+            scene_groups[filtered_scenes.descriptions[filtered_scenes.entity_idx[frame_idx]]].append(frame_idx)
         
         # Create consolidated scenes
         consolidated_scenes = []
-        for description, frames in scene_groups.items():
-            if len(frames) < 1:  # Need at least 1 frame
-                continue
-                
-            frames.sort(key=lambda x: x['time_offset'])
+        for description, frame_idxs in scene_groups.items():
+            frame_idxs = np.array(frame_idxs)
+            frame_times = filtered_scenes.time_offsets[frame_idxs]
+            by_time = np.argsort(frame_times, kind='stable')
             
-            start_time = frames[0]['time_offset']
-            end_time = frames[-1]['time_offset']
+            start_time = float(frame_times[by_time[0]])
+            end_time = float(frame_times[by_time[-1]])
             
             # Expand boundaries for single frame scenes
-            if len(frames) == 1:
+            if len(frame_idxs) == 1:
                 start_time = max(0, start_time - 2.0)
                 end_time = min(video_duration, end_time + 2.0)
             
-            avg_confidence = statistics.mean([f['confidence'] for f in frames])
-            priority = frames[0]['priority']
+            avg_confidence = float(filtered_scenes.confidences[frame_idxs].mean(dtype=np.float64))
+            priority = int(filtered_scenes.priorities[frame_idxs[by_time[0]]])
             
             consolidated_scenes.append({
                 'scene_type': description,
+                'scene_type_lower': description.lower(),
                 'start_time': start_time,
                 'end_time': end_time,
                 'duration': end_time - start_time,
                 'confidence': avg_confidence,
                 'keyframe_timestamp': (start_time + end_time) / 2,
-                'frame_count': len(frames),
+                'frame_count': len(frame_idxs),
                 'priority': priority
             })
         
@@ -351,8 +472,8 @@ class VideoClassificationManager:
         return consolidated_scenes
     
     def _extract_keyframes_for_scenes(self, video_uri: str, scenes: List[Dict[str, Any]], 
-                                    user_id: str, project_id: str) -> List[Dict[str, Any]]:
-        """Extract keyframes for top scenes using FFmpeg with ADR-002 cost control"""
+                                    user_id: str, project_id: str, temp_dir_path: Path) -> List[Dict[str, Any]]:
+        """Extract keyframes for top scenes using OpenCV with ADR-002 cost control"""
         if not scenes:
             return []
         
@@ -365,42 +486,66 @@ class VideoClassificationManager:
         scenes_with_keyframes = []
         bucket_name = settings.GCP.Storage.USER_BUCKET
         
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_dir_path = Path(temp_dir)
-            
-            # Download video locally for FFmpeg processing
-            local_video_path = temp_dir_path / "video.mp4"
+        # Videos of a classify_videos call run concurrently and share the temp dir and keyframe folder,
+        # so local and GCS names are prefixed per video
+        video_key = hashlib.md5(video_uri.encode()).hexdigest()[:12]
+        
+        # Extract every keyframe from a single open of the video
+        scene_ids = [f"scene_{scene['start_time']:.1f}s" for scene in high_confidence_scenes]
+        keyframe_filenames = [f"keyframe_{scene_id}.jpg" for scene_id in scene_ids]
+        timestamps = [scene['keyframe_timestamp'] for scene in high_confidence_scenes]
+        output_paths = [str(temp_dir_path / f"{video_key}_{keyframe_filename}") for keyframe_filename in keyframe_filenames]
+        
+        # Read straight from a signed URL - OpenCV's FFmpeg backend range-reads the index and the
+        # GOPs around each timestamp instead of downloading the whole video
+        extracted = []
+        try:
+            signed_url = StorageManager.generate_signed_url_from_gs_url(video_uri)
+            extracted = self._extract_keyframes(signed_url, timestamps, output_paths)
+        except Exception as e:
+            logger.warning(f"[VIDEO_CLASSIFIER] Streaming keyframe extraction failed for {video_uri}: {e}")
+        
+        if not any(extracted):
+            # Fallback - download the video locally
+            local_video_path = temp_dir_path / f"{video_key}.mp4"
             self._download_video_from_gcs(video_uri, str(local_video_path))
+            extracted = self._extract_keyframes(str(local_video_path), timestamps, output_paths)
+            local_video_path.unlink(missing_ok=True)
+        
+        # Upload keyframes to GCS concurrently
+        upload_futures = {}
+        extracted_scenes = []
+        for scene, scene_id, keyframe_filename, output_path, success in zip(
+            high_confidence_scenes, scene_ids, keyframe_filenames, output_paths, extracted
+        ):
+            if success:
+                keyframe_blob_name = f"tests/video-intelligence/keyframes/{video_key}_{keyframe_filename}"
+                future = self._upload_pool.submit(
+                    self._upload_keyframe_to_gcs, output_path, bucket_name, keyframe_blob_name
+                )
+                upload_futures[future] = (scene, scene_id)
+                scene['keyframe_path'] = output_path
+                extracted_scenes.append(scene)
+        
+        # Meanwhile label the local frames - Vision takes the bytes inline, so it does not have
+        # to wait for the uploads to land in GCS
+        self._analyze_keyframes_with_vision(extracted_scenes)
+        for scene in extracted_scenes:
+            del scene['keyframe_path']  # Only valid inside this temp dir
+        
+        for future in as_completed(upload_futures):
+            scene, scene_id = upload_futures[future]
+            try:
+                keyframe_uri = future.result()
+                if keyframe_uri:
+                    scene['keyframe_uri'] = keyframe_uri
+                    scene['scene_id'] = scene_id
+                    scenes_with_keyframes.append(scene)
+                    logger.debug(f"[VIDEO_CLASSIFIER] Extracted keyframe for scene {scene_id}")
             
-            for scene in high_confidence_scenes:
-                try:
-                    timestamp = scene['keyframe_timestamp']
-                    scene_id = f"scene_{scene['start_time']:.1f}s"
-                    
-                    # Extract keyframe using FFmpeg
-                    keyframe_filename = f"keyframe_{scene_id}.jpg"
-                    local_keyframe_path = temp_dir_path / keyframe_filename
-                    
-                    success = self._extract_keyframe_with_ffmpeg(
-                        str(local_video_path), timestamp, str(local_keyframe_path)
-                    )
-                    
-                    if success:
-                        # Upload keyframe to GCS
-                        keyframe_blob_name = f"tests/video-intelligence/keyframes/{keyframe_filename}"
-                        keyframe_uri = self._upload_keyframe_to_gcs(
-                            str(local_keyframe_path), bucket_name, keyframe_blob_name
-                        )
-                        
-                        if keyframe_uri:
-                            scene['keyframe_uri'] = keyframe_uri
-                            scene['scene_id'] = scene_id
-                            scenes_with_keyframes.append(scene)
-                            logger.debug(f"[VIDEO_CLASSIFIER] Extracted keyframe for scene {scene_id}")
-                
-                except Exception as e:
-                    logger.warning(f"[VIDEO_CLASSIFIER] Failed to extract keyframe for scene: {e}")
-                    continue
+            except Exception as e:
+                logger.warning(f"[VIDEO_CLASSIFIER] Failed to extract keyframe for scene: {e}")
+                continue
         
         logger.info(f"[VIDEO_CLASSIFIER] Successfully extracted {len(scenes_with_keyframes)} keyframes")
         return scenes_with_keyframes
@@ -416,23 +561,32 @@ class VideoClassificationManager:
         blob = bucket.blob(blob_name)
         blob.download_to_filename(local_path)
     
-    def _extract_keyframe_with_ffmpeg(self, video_path: str, timestamp: float, output_path: str) -> bool:
-        """Extract a single keyframe using FFmpeg"""
+    def _extract_keyframes(self, video_path: str, timestamps: List[float], output_paths: List[str]) -> List[bool]:
+        """
+        Extract one frame per timestamp in-process with OpenCV - the container is opened once and
+        timestamps are visited in ascending order, so each seek moves the same decoder forward
+        """
+        results = [False] * len(timestamps)
+        if not timestamps:
+            return results
+        
+        cap = cv2.VideoCapture(video_path)
         try:
-            command = [
-                "ffmpeg", "-i", video_path,
-                "-ss", str(timestamp),
-                "-vframes", "1",
-                "-q:v", "2",  # High quality
-                output_path,
-                "-y"  # Overwrite if exists
-            ]
-            
-            result = subprocess.run(command, capture_output=True, text=True, timeout=30)
-            return result.returncode == 0 and Path(output_path).exists()
-            
-        except (subprocess.TimeoutExpired, subprocess.CalledProcessError):
-            return False
+            if not cap.isOpened():
+                logger.warning(f"[VIDEO_CLASSIFIER] Could not open video for keyframe extraction: {video_path}")
+                return results
+            
+            for idx in sorted(range(len(timestamps)), key=lambda i: timestamps[i]):
+                cap.set(cv2.CAP_PROP_POS_MSEC, timestamps[idx] * 1000)
+                ret, frame = cap.read()
+                if not ret or frame is None:
+                    logger.warning(f"[VIDEO_CLASSIFIER] Could not read frame at timestamp {timestamps[idx]}")
+                    continue
+                results[idx] = cv2.imwrite(output_paths[idx], frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
+        finally:
+            cap.release()
+        
+        return results
     
     def _upload_keyframe_to_gcs(self, local_path: str, bucket_name: str, blob_name: str) -> Optional[str]:
         """Upload keyframe to GCS and return the GCS URI"""
@@ -445,6 +599,32 @@ class VideoClassificationManager:
             logger.error(f"[VIDEO_CLASSIFIER] Failed to upload keyframe: {e}")
             return None
     
+    @staticmethod
+    def _keyframe_image(scene: Dict[str, Any]) -> vision.Image:
+        """Vision image for a scene keyframe - inline bytes of the local frame when available, else its GCS URI"""
+        if scene.get('keyframe_path'):
+            return vision.Image(content=Path(scene['keyframe_path']).read_bytes())
+        return vision.Image(source=vision.ImageSource(image_uri=scene['keyframe_uri']))
+    
+    def _vision_batches(self, scenes: List[Dict[str, Any]]):
+        """
+        Yield (scenes, images) batches for batch_annotate_images - at most VISION_BATCH_SIZE images and
+        VISION_BATCH_MAX_BYTES of inline frames each, so high-resolution keyframes don't push a whole
+        request over the payload limit (a frame above the budget goes alone and only fails itself)
+        """
+        batch, images, batch_bytes = [], [], 0
+        for scene in scenes:
+            image = self._keyframe_image(scene)
+            image_bytes = len(image.content)
+            if batch and (len(batch) == VISION_BATCH_SIZE or batch_bytes + image_bytes > VISION_BATCH_MAX_BYTES):
+                yield batch, images
+                batch, images, batch_bytes = [], [], 0
+            batch.append(scene)
+            images.append(image)
+            batch_bytes += image_bytes
+        if batch:
+            yield batch, images
+    
     def _analyze_keyframes_with_vision(self, scenes_with_keyframes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Analyze extracted keyframes using Google Vision API with ADR-002 exact match priority"""
         if not scenes_with_keyframes:
@@ -452,21 +632,34 @@ class VideoClassificationManager:
         
         logger.info(f"[VIDEO_CLASSIFIER] Analyzing {len(scenes_with_keyframes)} keyframes with Vision API")
         
-        vision_enhanced_scenes = []
-        for scene in scenes_with_keyframes:
+        # Scenes without a keyframe pass through, the rest are labeled in batches (bounded by image
+        # count and inline bytes) instead of one RPC per keyframe
+        scenes_to_label = [
+            scene for scene in scenes_with_keyframes if scene.get('keyframe_path') or scene.get('keyframe_uri')
+        ]
+        for batch, images in self._vision_batches(scenes_to_label):
             try:
-                keyframe_uri = scene.get('keyframe_uri')
-                if not keyframe_uri:
-                    vision_enhanced_scenes.append(scene)
+                response = self.vision_client.batch_annotate_images(
+                    requests=[
+                        vision.AnnotateImageRequest(
+                            image=image,
+                            features=[vision.Feature(type_=vision.Feature.Type.LABEL_DETECTION)]
+                        )
+                        for image in images
+                    ]
+                )
+            except Exception as e:
+                logger.warning(f"[VIDEO_CLASSIFIER] Vision API batch analysis failed for {len(batch)} scenes: {e}")
+                continue  # Scenes stay without vision enhancement
+            
+            for scene, image_response in zip(batch, response.responses):
+                if image_response.error.message:
+                    logger.warning(f"[VIDEO_CLASSIFIER] Vision API analysis failed for scene: {image_response.error.message}")
                     continue
                 
-                # Perform Vision API label detection
-                image = vision.Image(source=vision.ImageSource(image_uri=keyframe_uri))
-                response = self.vision_client.label_detection(image=image)
-                
                 # Process labels with confidence >= 0.75
                 vision_labels = []
-                for label in response.label_annotations:
+                for label in image_response.label_annotations:
                     if label.score >= 0.75:
                         vision_labels.append({
                             "description": label.description.lower(),
@@ -480,16 +673,8 @@ class VideoClassificationManager:
                 scene['vision_labels'] = vision_labels
                 scene['vision_room'] = vision_room
                 scene['vision_confidence'] = vision_confidence
-                
-                vision_enhanced_scenes.append(scene)
-                
-                # Brief pause to respect API limits
-                time.sleep(0.1)
-                
-            except Exception as e:
-                logger.warning(f"[VIDEO_CLASSIFIER] Vision API analysis failed for scene: {e}")
-                vision_enhanced_scenes.append(scene)  # Add scene without vision enhancement
-                continue
+        
+        vision_enhanced_scenes = list(scenes_with_keyframes)
         
         logger.info(f"[VIDEO_CLASSIFIER] Vision API analysis completed for {len(vision_enhanced_scenes)} scenes")
         return vision_enhanced_scenes
@@ -499,33 +684,28 @@ class VideoClassificationManager:
         if not vision_labels or not self.room_mapping:
             return None, 0.0
         
+        # Descriptions are lowercased when the labels are collected
+        room_matches = [self._room_matches(vision_label['description']) for vision_label in vision_labels]
+        
         # Priority 1: Check for exact room name matches
-        for vision_label in vision_labels:
-            description = vision_label['description'].lower()
-            confidence = vision_label['confidence']
-            
-            for room_type in self.room_mapping.keys():
-                if description == room_type.lower() or room_type.lower() in description:
-                    logger.debug(f"[VIDEO_CLASSIFIER] Exact match: '{description}' → '{room_type}' (confidence: {confidence:.3f})")
-                    return room_type, confidence
+        for vision_label, (exact_room, _) in zip(vision_labels, room_matches):
+            if exact_room:
+                confidence = vision_label['confidence']
+                logger.debug(f"[VIDEO_CLASSIFIER] Exact match: '{vision_label['description']}' → '{exact_room}' (confidence: {confidence:.3f})")
+                return exact_room, confidence
         
         # Priority 2: Indicator-based matching
         room_scores = defaultdict(list)
-        for vision_label in vision_labels:
-            description = vision_label['description'].lower()
-            confidence = vision_label['confidence']
-            
-            for room_type, room_indicators in self.room_mapping.items():
-                for indicator in room_indicators:
-                    if indicator.lower() in description or description in indicator.lower():
-                        room_scores[room_type].append(confidence)
+        for vision_label, (_, indicator_rooms) in zip(vision_labels, room_matches):
+            for room_type in indicator_rooms:
+                room_scores[room_type].append(vision_label['confidence'])
         
         # Find the room with highest average confidence
         best_room = None
         best_score = 0.0
         
         for room_type, scores in room_scores.items():
-            avg_score = statistics.mean(scores)
+            avg_score = sum(scores) / len(scores)
             if avg_score > best_score:
                 best_score = avg_score
                 best_room = room_type
@@ -535,6 +715,22 @@ class VideoClassificationManager:
         
         return best_room, best_score
     
+    def _match_description_to_rooms(self, description: str) -> Tuple[Optional[str], Tuple[str, ...]]:
+        """
+        Room types a lowercased label description matches - the first exact room name match, and
+        the room type of every matching indicator (repeated per indicator, each one adds a score)
+        """
+        exact_room = next(
+            (room_type for room_type, room_type_lc in self._room_types_lc if room_type_lc in description),
+            None
+        )
+        # Containment both ways - a short label like 'bath' still hits the 'bathtub' indicator
+        indicator_rooms = tuple(
+            room_type for indicator_lc, room_type in self._indicator_rooms_lc
+            if indicator_lc in description or description in indicator_lc
+        )
+        return exact_room, indicator_rooms
+    
     def _apply_hybrid_classification_rules(self, vision_enhanced_scenes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Apply ADR-002 hybrid classification rules to determine final scene categories"""
         final_scenes = []
@@ -558,7 +754,7 @@ class VideoClassificationManager:
                 logger.debug(f"[VIDEO_CLASSIFIER] Vision API override: '{original_type}' → '{vision_room}'")
             
             # Priority 2: Keep specific Video Intelligence scenes
-            elif self._is_specific_scene_related(original_type):
+            elif self._is_specific_scene_related(scene['scene_type_lower']):
                 detection_source = "video_intelligence"
                 logger.debug(f"[VIDEO_CLASSIFIER] Kept Video Intelligence: '{original_type}'")
             
@@ -591,38 +787,22 @@ class VideoClassificationManager:
         logger.info(f"[VIDEO_CLASSIFIER] Applied hybrid classification rules to {len(final_scenes)} scenes")
         return final_scenes
     
-    def _is_specific_scene_related(self, description: str) -> bool:
-        """Check if a description is a specific scene type"""
-        specific_keywords = {
-            'bedroom', 'bathroom', 'kitchen', 'living room', 'dining room', 'office', 
-            'outdoor', 'pool', 'swimming pool', 'patio', 'balcony', 'garage'
-        }
-        return any(keyword in description.lower() for keyword in specific_keywords)
+    def _is_specific_scene_related(self, description_lower: str) -> bool:
+        """Check if an already lowercased description is a specific scene type"""
+        return _SPECIFIC_SCENE_RELATED_RE.search(description_lower) is not None
     
     def _add_scenes_to_buckets(self, video_buckets: VideoSceneBuckets, final_scenes: List[Dict[str, Any]], source_video_uri: str):
         """Add final scenes to the video buckets using streamlined storage format"""
+        scenes_by_category = defaultdict(list)
         for scene in final_scenes:
             # Map to existing categories or use 'Other'
             category = scene['scene_type']
             if category not in self.model.categories:
                 # Try to map to existing categories
-                category_mapping = {
-                    'living room': 'Interior',
-                    'kitchen': 'Interior', 
-                    'bedroom': 'Interior',
-                    'bathroom': 'Interior',
-                    'dining room': 'Interior',
-                    'office': 'Interior',
-                    'outdoor': 'Exterior',
-                    'pool': 'Exterior',
-                    'swimming pool': 'Exterior',
-                    'patio': 'Exterior',
-                    'balcony': 'Exterior'
-                }
-                category = category_mapping.get(category.lower(), 'Other')
+                category = _SCENE_CATEGORY_MAPPING.get(category.lower(), 'Other')
             
-            # Create scene item
-            scene_item = VideoSceneBuckets.SceneItem(
+            # Create scene item - fields come straight from the pipeline above, so skip validation
+            scene_item = VideoSceneBuckets.SceneItem.model_construct(
                 scene_id=scene['scene_id'],
                 source_video_uri=source_video_uri,
                 start_time=scene['start_time'],
@@ -632,7 +812,10 @@ class VideoClassificationManager:
                 keyframe_uri=scene.get('keyframe_uri')
             )
             
-            # Add to bucket
-            video_buckets.add_scene_to_bucket(category, scene_item)
+            scenes_by_category[category].append(scene_item)
+        
+        # Add to buckets
+        for category, scene_items in scenes_by_category.items():
+            video_buckets.extend_bucket(category, scene_items)
         
         logger.debug(f"[VIDEO_CLASSIFIER] Added {len(final_scenes)} scenes to buckets")
@@ -3,7 +3,10 @@ VideoSceneBuckets: Streamlined storage model for video scene classification resu
 Mirrors ImageBuckets structure for consistency across media types
 """
 
-from typing import Dict, List, Any, Optional
+import heapq
+from collections import Counter
+from itertools import chain
+from typing import Dict, List, Any, Iterator, Optional
 from pydantic import BaseModel, Field
 
 
@@ -49,10 +52,11 @@ class VideoSceneBuckets(BaseModel):
     
     def get_all_scenes(self) -> List[SceneItem]:
         """Get all scenes across all categories"""
-        all_scenes = []
-        for scenes in self.buckets.values():
-            all_scenes.extend(scenes)
-        return all_scenes
+        return list(self.iter_all_scenes())
+    
+    def iter_all_scenes(self) -> Iterator[SceneItem]:
+        """Iterate all scenes across all categories without building a list"""
+        return chain.from_iterable(self.buckets.values())
     
     def get_categories(self) -> List[str]:
         """Get list of all categories with scenes"""
@@ -64,9 +68,16 @@ class VideoSceneBuckets(BaseModel):
     
     def add_scene_to_bucket(self, category: str, scene: SceneItem):
         """Add a scene to the specified category bucket"""
-        if category not in self.buckets:
-            self.buckets[category] = []
-        self.buckets[category].append(scene)
+        self.buckets.setdefault(category, []).append(scene)
+        self.total_scenes += 1
+    
+    def extend_bucket(self, category: str, scenes: List[SceneItem]):
+        """Add several scenes to the specified category bucket"""
+        self.buckets.setdefault(category, []).extend(scenes)
+        self.total_scenes += len(scenes)
+    
+    def recompute_totals(self):
+        """Recount total_scenes - only needed after mutating `buckets` directly"""
         self.total_scenes = sum(len(scenes) for scenes in self.buckets.values())
     
     def sort_scenes_by_confidence(self):
@@ -74,11 +85,31 @@ class VideoSceneBuckets(BaseModel):
         for category in self.buckets:
             self.buckets[category].sort(key=lambda scene: scene.confidence, reverse=True)
     
+    def top_k_scenes_by_confidence(self, k: int) -> Dict[str, List[SceneItem]]:
+        """
+        Top `k` scenes of each bucket by confidence (highest first) without sorting the buckets -
+        same scenes and order as sort_scenes_by_confidence() followed by [:k]
+        """
+        return {
+            category: heapq.nlargest(k, scenes, key=lambda scene: scene.confidence)
+            for category, scenes in self.buckets.items()
+        }
+    
     def get_summary_stats(self) -> Dict[str, Any]:
         """Get summary statistics for the classification results"""
-        all_scenes = self.get_all_scenes()
+        # One pass over every bucket for all aggregates, without materializing the scene list
+        total_scenes = 0
+        confidence_sum = 0.0
+        scenes_with_keyframes = 0
+        source_counts = Counter()
+        for scene in self.iter_all_scenes():
+            total_scenes += 1
+            confidence_sum += scene.confidence
+            if scene.keyframe_uri:
+                scenes_with_keyframes += 1
+            source_counts[scene.detection_source] += 1
         
-        if not all_scenes:
+        if not total_scenes:
             return {
                 "total_scenes": 0,
                 "categories": 0,
@@ -86,16 +117,11 @@ class VideoSceneBuckets(BaseModel):
                 "detection_sources": {}
             }
         
-        # Calculate detection source distribution
-        source_counts = {}
-        for scene in all_scenes:
-            source_counts[scene.detection_source] = source_counts.get(scene.detection_source, 0) + 1
-        
         return {
-            "total_scenes": len(all_scenes),
+            "total_scenes": total_scenes,
             "categories": len(self.buckets),
-            "avg_confidence": sum(scene.confidence for scene in all_scenes) / len(all_scenes),
-            "detection_sources": source_counts,
-            "scenes_with_keyframes": len([s for s in all_scenes if s.keyframe_uri]),
+            "avg_confidence": confidence_sum / total_scenes,
+            "detection_sources": dict(source_counts),
+            "scenes_with_keyframes": scenes_with_keyframes,
             "category_distribution": self.get_scene_count_by_category()
         }
@@ -1,5 +1,10 @@
 import os
-from typing import List, Optional, Dict, Any
+import re
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import chain
+from typing import ClassVar, List, Optional, Dict, Any
 from pathlib import Path
 from logger import logger
 from config.config import settings
@@ -9,13 +14,24 @@ from classification.types.media_models import (
     MediaType, MediaInventory, ImageMedia, VideoMedia, SceneClipMedia
 )
 
+# Scene clip filenames: {video_id}_scene_{idx}_{start}_{end}.{ext}, split on '_' - the first part
+# that is exactly 'scene', followed by the index, start and end parts (the end part up to its 1st '.')
+_SCENE_CLIP_RE = re.compile(r'^(?P<clip_id>(?:[^_]*_)*?scene_[^_]*)_(?P<start>[^_]*)_(?P<end>[^_.]*)')
+
+
+@lru_cache(maxsize=256)
+def _cloud_path_from(path: str) -> CloudPath:
+    # Repo paths repeat per user/property across requests - the shared instance is only read
+    return CloudPath.from_path(path)
+
 
 class MediaTypeDetector:
     """Service to detect and categorize media types in project storage"""
     
     # Define supported file extensions
-    IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.webp', '.avif', '.bmp', '.tiff'}
-    VIDEO_EXTENSIONS = {'.mp4', '.mov', '.avi', '.mkv', '.webm', '.m4v', '.3gp'}
+    IMAGE_EXTENSIONS: ClassVar[frozenset[str]] = frozenset({'.jpg', '.jpeg', '.png', '.webp', '.avif', '.bmp', '.tiff'})
+    VIDEO_EXTENSIONS: ClassVar[frozenset[str]] = frozenset({'.mp4', '.mov', '.avi', '.mkv', '.webm', '.m4v', '.3gp'})
+    _EXT_TO_TYPE: ClassVar[dict[str, MediaType]] = {ext: MediaType.IMAGE for ext in IMAGE_EXTENSIONS} | {ext: MediaType.VIDEO for ext in VIDEO_EXTENSIONS}
     
     def __init__(self):
         pass
@@ -41,29 +57,30 @@ class MediaTypeDetector:
                 logger.info(f"[MEDIA_DETECTOR] No media found for project {project_id}")
                 return MediaInventory()
             
-            # Categorize media by type
-            images = []
-            videos = []
-            scene_clips = []
+            # Group media paths by type, then build each group in one go - the URIs come straight
+            # from the bucket listing, so the models skip validation
+            paths_by_type = defaultdict(list)
             categorization_errors = 0
             
             for media_path in all_media_paths:
                 try:
-                    media_type = self.detect_media_type(media_path)
-                    
-                    if media_type == MediaType.IMAGE:
-                        images.append(ImageMedia(uri=media_path))
-                    elif media_type == MediaType.VIDEO:
-                        videos.append(VideoMedia(uri=media_path))
-                    elif media_type == MediaType.SCENE_CLIP:
-                        scene_clips.append(self._parse_scene_clip(media_path))
-                    else:
-                        logger.warning(f"[MEDIA_DETECTOR] Unknown media type for: {media_path}")
-                        
+                    paths_by_type[self.detect_media_type(media_path)].append(media_path)
+                except Exception as e:
+                    logger.warning(f"[MEDIA_DETECTOR] Failed to categorize {media_path}: {e}")
+                    categorization_errors += 1
+            
+            for media_path in paths_by_type[MediaType.UNKNOWN]:
+                logger.warning(f"[MEDIA_DETECTOR] Unknown media type for: {media_path}")
+            
+            images = [ImageMedia.model_construct(uri=media_path) for media_path in paths_by_type[MediaType.IMAGE]]
+            videos = [VideoMedia.model_construct(uri=media_path) for media_path in paths_by_type[MediaType.VIDEO]]
+            scene_clips = []
+            for media_path in paths_by_type[MediaType.SCENE_CLIP]:
+                try:
+                    scene_clips.append(self._parse_scene_clip(media_path))
                 except Exception as e:
                     logger.warning(f"[MEDIA_DETECTOR] Failed to categorize {media_path}: {e}")
                     categorization_errors += 1
-                    continue
             
             inventory = MediaInventory(
                 images=images,
@@ -99,19 +116,18 @@ class MediaTypeDetector:
             return MediaType.UNKNOWN
         
         # Check if it's a scene clip based on path structure
-        if '/scene_clips/' in gcs_path or '_scene_' in os.path.basename(gcs_path):
+        filename = gcs_path.rpartition('/')[2]
+        if '/scene_clips/' in gcs_path or '_scene_' in filename:
             return MediaType.SCENE_CLIP
         
-        # Get file extension
-        file_extension = Path(gcs_path).suffix.lower()
+        # Get file extension - string ops instead of a Path per call, same result as Path.suffix
+        stem, dot, ext = filename.rpartition('.')
+        file_extension = f".{ext.lower()}" if stem and ext else ''
         
-        if file_extension in self.IMAGE_EXTENSIONS:
-            return MediaType.IMAGE
-        elif file_extension in self.VIDEO_EXTENSIONS:
-            return MediaType.VIDEO
-        else:
+        media_type = self._EXT_TO_TYPE.get(file_extension, MediaType.UNKNOWN)
+        if media_type == MediaType.UNKNOWN:
             logger.warning(f"[MEDIA_DETECTOR] Unknown file extension: {file_extension} for {gcs_path}")
-            return MediaType.UNKNOWN
+        return media_type
     
     def _get_all_project_media_paths(self, user_id: str, project_id: str) -> List[str]:
         """
@@ -124,40 +140,41 @@ class MediaTypeDetector:
         Returns:
             List of GCS paths to all media files
         """
-        all_paths = []
+        cloud_paths = []
         
-        # Get traditional image repositories
+        # Get traditional image repositories (property repo first, in the properties bucket)
         try:
             logger.debug(f"[MEDIA_DETECTOR] Getting image repositories for project {project_id}")
             image_repos = StorageManager.get_image_repos_for_project(user_id, project_id)
             for repo_path in image_repos:
                 try:
-                    cloud_path = CloudPath.from_path(repo_path)
-                    repo_files = StorageManager.list_blobs_in_path(cloud_path)
-                    all_paths.extend(repo_files)
-                    logger.debug(f"[MEDIA_DETECTOR] Found {len(repo_files)} files in {repo_path}")
+                    cloud_paths.append(_cloud_path_from(repo_path))
                 except Exception as e:
-                    logger.warning(f"[MEDIA_DETECTOR] Failed to list files in {repo_path}: {e}")
+                    logger.warning(f"[MEDIA_DETECTOR] Invalid repository path {repo_path}: {e}")
                     continue
         except Exception as e:
             logger.error(f"[MEDIA_DETECTOR] Failed to get image repositories: {e}")
         
         # Get ALL media from videos folder (videos + scene clips unified)
+        logger.debug(f"[MEDIA_DETECTOR] Getting all media from videos folder for project {project_id}")
+        cloud_paths.append(CloudPath(
+            bucket_id=settings.GCP.Storage.USER_BUCKET,
+            path=Path(f"{user_id}/{project_id}/videos")
+        ))
+        
+        # The repos span buckets, so they can't be one prefix listing - list them concurrently,
+        # keeping repo order
+        with ThreadPoolExecutor(max_workers=len(cloud_paths)) as executor:
+            return list(chain.from_iterable(executor.map(self._list_media_in_path, cloud_paths)))
+    
+    def _list_media_in_path(self, cloud_path: CloudPath) -> List[str]:
         try:
-            logger.debug(f"[MEDIA_DETECTOR] Getting all media from videos folder for project {project_id}")
-            cloud_path = CloudPath(
-                bucket_id=settings.GCP.Storage.USER_BUCKET,
-                path=Path(f"{user_id}/{project_id}/videos")
-            )
-            
-            video_folder_files = StorageManager.list_blobs_in_path(cloud_path)
-            all_paths.extend(video_folder_files)
-            logger.debug(f"[MEDIA_DETECTOR] Found {len(video_folder_files)} files in videos folder")
-            
+            files = StorageManager.list_blobs_in_path(cloud_path)
+            logger.debug(f"[MEDIA_DETECTOR] Found {len(files)} files in {cloud_path.full_path()}")
+            return files
         except Exception as e:
-            logger.warning(f"[MEDIA_DETECTOR] Failed to get files from videos folder: {e}")
-        
-        return all_paths
+            logger.warning(f"[MEDIA_DETECTOR] Failed to list files in {cloud_path.full_path()}: {e}")
+            return []
     
     def _parse_scene_clip(self, scene_clip_path: str) -> SceneClipMedia:
         """
@@ -171,33 +188,30 @@ class MediaTypeDetector:
         """
         # Extract metadata from filename (assuming format: video_id_scene_001_start_end.mp4)
         filename = os.path.basename(scene_clip_path)
-        name_parts = filename.split('_')
         
-        try:
-            # Try to extract timing information from filename
-            if 'scene' in name_parts:
-                scene_idx = name_parts.index('scene')
-                if len(name_parts) > scene_idx + 3:
-                    start_time = float(name_parts[scene_idx + 2])
-                    end_time = float(name_parts[scene_idx + 3].split('.')[0])  # Remove extension
-                    clip_id = '_'.join(name_parts[:scene_idx + 2])
-                    
-                    # Reconstruct source video URI (this might need adjustment based on actual storage structure)
-                    source_video_uri = scene_clip_path.replace('/scene_clips/', '/videos/').replace(filename, f"{name_parts[0]}.mp4")
-                    
-                    return SceneClipMedia(
-                        uri=scene_clip_path,
-                        source_video_uri=source_video_uri,
-                        start_time=start_time,
-                        end_time=end_time,
-                        duration=end_time - start_time,
-                        clip_id=clip_id
-                    )
-        except (ValueError, IndexError) as e:
-            logger.warning(f"[MEDIA_DETECTOR] Could not parse scene clip metadata from {filename}: {e}")
+        match = _SCENE_CLIP_RE.match(filename)
+        if match:
+            try:
+                start_time = float(match['start'])
+                end_time = float(match['end'])
+                clip_id = match['clip_id']
+                
+                # Reconstruct source video URI (this might need adjustment based on actual storage structure)
+                source_video_uri = scene_clip_path.replace('/scene_clips/', '/videos/').replace(filename, f"{filename.split('_', 1)[0]}.mp4")
+                
+                return SceneClipMedia.model_construct(
+                    uri=scene_clip_path,
+                    source_video_uri=source_video_uri,
+                    start_time=start_time,
+                    end_time=end_time,
+                    duration=end_time - start_time,
+                    clip_id=clip_id
+                )
+            except ValueError as e:
+                logger.warning(f"[MEDIA_DETECTOR] Could not parse scene clip metadata from {filename}: {e}")
         
         # Fallback: create basic scene clip with default values
-        return SceneClipMedia(
+        return SceneClipMedia.model_construct(
             uri=scene_clip_path,
             source_video_uri="unknown",
             start_time=0.0,
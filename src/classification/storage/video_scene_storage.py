@@ -5,14 +5,23 @@ Stores data at projects/{project_id} with key 'video_scenes_classification' for
 """
 
 from typing import Dict, List, Any, Optional
-from pathlib import Path
 from datetime import datetime
 
+from google.api_core.exceptions import NotFound
+from google.cloud import firestore
+
 from logger import logger
+from database.db_manager import unified_db_manager
+from services.project_service import project_service
 from utils.session_utils import get_session_refs_by_ids
 from config.config import settings
 
 
+def _basename(uri: str) -> str:
+    # Same as Path(uri).name for gs:// URIs, without building a Path
+    return uri.rpartition('/')[2]
+
+
 class VideoScenesStorage:
     """
     Manages storage and retrieval of enhanced video scene classifications.
@@ -22,6 +31,65 @@ class VideoScenesStorage:
     # Storage key in project document (following image_classification pattern)
     VIDEO_SCENES_CLASSIFICATION_KEY = "video_scenes_classification"
     
+    @classmethod
+    def _video_field_path(cls, video_filename: str) -> str:
+        # Filenames contain dots, FieldPath quotes them so they stay a single path segment
+        return firestore.FieldPath(cls.VIDEO_SCENES_CLASSIFICATION_KEY, "videos", video_filename).to_api_repr()
+    
+    @classmethod
+    def _write_videos_postgresql(cls, user_id: str, project_id: str,
+                                 stored_videos: Optional[Dict[str, Dict[str, Any]]] = None,
+                                 deleted_video: Optional[str] = None) -> bool:
+        """
+        Store and/or delete video entries on PostgreSQL, where there are no field paths - read the
+        classification, change its videos and write it back to the project metadata through the
+        project service (the metadata is flattened back to the top level on read)
+        
+        Returns:
+            bool: True if the project was updated (or there was nothing to delete), False otherwise
+        """
+        project_data = project_service.get_project(user_id, project_id)
+        if project_data is None:
+            logger.warning(f"[VIDEO_SCENES_STORAGE] Project {project_id} not found")
+            return False
+        
+        classification = dict(project_data.get(cls.VIDEO_SCENES_CLASSIFICATION_KEY) or {})
+        videos = dict(classification.get("videos") or {})
+        if deleted_video is not None:
+            if deleted_video not in videos and not stored_videos:
+                return True  # Nothing stored for the video
+            videos.pop(deleted_video, None)
+        videos.update(stored_videos or {})
+        classification["videos"] = videos
+        
+        updated = project_service.update_project(
+            user_id, project_id, {"metadata": {cls.VIDEO_SCENES_CLASSIFICATION_KEY: classification}}
+        )
+        return updated is not None
+    
+    @classmethod
+    def fetch_project_data(cls, user_id: str, project_id: str,
+                           field_paths: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Fetch the project document once, for callers that need several of the read methods below -
+        pass the result as their `project_data` so they share a single Firestore read.
+        
+        Args:
+            user_id: User ID
+            project_id: Project ID
+            field_paths: Only transfer these fields, defaults to the video scenes classification (Firestore only)
+            
+        Returns:
+            The (projected) project document as a dict, or None if the project doesn't exist
+        """
+        _, project_ref, _ = get_session_refs_by_ids(user_id=user_id, project_id=project_id)
+        if unified_db_manager.is_postgresql_active():
+            # The PostgreSQL compatibility refs read the whole project, without projections
+            project_doc = project_ref.get()
+        else:
+            project_doc = project_ref.get(field_paths=field_paths or [cls.VIDEO_SCENES_CLASSIFICATION_KEY])
+        return project_doc.to_dict() if project_doc.exists else None
+    
     @classmethod
     def store_video_scenes(cls, user_id: str, project_id: str, video_uri: str, 
                           video_scenes_data: Dict[str, Any]) -> bool:
@@ -54,27 +122,25 @@ class VideoScenesStorage:
             bool: True if storage successful, False otherwise
         """
         try:
-            # Get project reference
-            _, project_ref, _ = get_session_refs_by_ids(user_id=user_id, project_id=project_id)
-            
             # Extract video filename for key
-            video_filename = Path(video_uri).name
+            video_filename = _basename(video_uri)
             
-            # Get existing data or initialize
-            project_doc = project_ref.get()
-            project_data = project_doc.to_dict() if project_doc.exists else {}
+            if unified_db_manager.is_postgresql_active():
+                if not cls._write_videos_postgresql(user_id, project_id, stored_videos={video_filename: video_scenes_data}):
+                    logger.error(f"[VIDEO_SCENES_STORAGE] Failed to store scene classification for {video_filename}")
+                    return False
+                logger.info(f"[VIDEO_SCENES_STORAGE] Stored scene classification for {video_filename} with {video_scenes_data.get('total_scenes', 0)} scenes")
+                return True
             
-            # Initialize video scenes classification structure if needed
-            if cls.VIDEO_SCENES_CLASSIFICATION_KEY not in project_data:
-                project_data[cls.VIDEO_SCENES_CLASSIFICATION_KEY] = {"videos": {}}
-            elif "videos" not in project_data[cls.VIDEO_SCENES_CLASSIFICATION_KEY]:
-                project_data[cls.VIDEO_SCENES_CLASSIFICATION_KEY]["videos"] = {}
-            
-            # Store video scene data
-            project_data[cls.VIDEO_SCENES_CLASSIFICATION_KEY]["videos"][video_filename] = video_scenes_data
+            # Get project reference
+            _, project_ref, _ = get_session_refs_by_ids(user_id=user_id, project_id=project_id)
             
-            # Update project document
-            project_ref.set({cls.VIDEO_SCENES_CLASSIFICATION_KEY: project_data[cls.VIDEO_SCENES_CLASSIFICATION_KEY]}, merge=True)
+            # Write just this video's entry - Firestore creates the intermediate maps, no read needed
+            try:
+                project_ref.update({cls._video_field_path(video_filename): video_scenes_data})
+            except NotFound:
+                # Project document doesn't exist yet
+                project_ref.set({cls.VIDEO_SCENES_CLASSIFICATION_KEY: {"videos": {video_filename: video_scenes_data}}}, merge=True)
             
             logger.info(f"[VIDEO_SCENES_STORAGE] Stored scene classification for {video_filename} with {video_scenes_data.get('total_scenes', 0)} scenes")
             return True
@@ -84,7 +150,52 @@ class VideoScenesStorage:
             return False
     
     @classmethod
-    def fetch_video_scenes(cls, user_id: str, project_id: str, video_uri: str) -> Optional[Dict[str, Any]]:
+    def store_multiple_video_scenes(cls, user_id: str, project_id: str,
+                                    video_scenes_by_uri: Dict[str, Dict[str, Any]]) -> bool:
+        """
+        Store scene classification data for several videos of a project in a single Firestore write.
+        Same storage pattern as store_video_scenes.
+        
+        Args:
+            user_id: User ID
+            project_id: Project ID
+            video_scenes_by_uri: Complete video scene classification data keyed by video GCS URI
+            
+        Returns:
+            bool: True if storage successful, False otherwise
+        """
+        if not video_scenes_by_uri:
+            return True
+        
+        try:
+            videos = {_basename(video_uri): data for video_uri, data in video_scenes_by_uri.items()}
+            
+            if unified_db_manager.is_postgresql_active():
+                if not cls._write_videos_postgresql(user_id, project_id, stored_videos=videos):
+                    logger.error(f"[VIDEO_SCENES_STORAGE] Failed to store scene classifications for {len(videos)} videos")
+                    return False
+            else:
+                # Get project reference
+                _, project_ref, _ = get_session_refs_by_ids(user_id=user_id, project_id=project_id)
+                
+                # All the videos live in the same project document - one update sets every entry
+                try:
+                    project_ref.update({cls._video_field_path(filename): data for filename, data in videos.items()})
+                except NotFound:
+                    # Project document doesn't exist yet
+                    project_ref.set({cls.VIDEO_SCENES_CLASSIFICATION_KEY: {"videos": videos}}, merge=True)
+            
+            logger.info(f"[VIDEO_SCENES_STORAGE] Stored scene classification for {len(videos)} videos with "
+                        f"{sum(data.get('total_scenes', 0) for data in videos.values())} scenes")
+            return True
+            
+        except Exception as e:
+            logger.error(f"[VIDEO_SCENES_STORAGE] Failed to store video scene classifications: {e}")
+            return False
+    
+    @classmethod
+    def fetch_video_scenes(cls, user_id: str, project_id: str, video_uri: str,
+                           project_data: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
         """
         Fetch enhanced video scene classification data from Firestore.
         
@@ -92,25 +203,24 @@ class VideoScenesStorage:
             user_id: User ID
             project_id: Project ID
             video_uri: GCS URI of the video (used to extract filename)
+            project_data: Project document from fetch_project_data, fetched here if not given
             
         Returns:
             Dict with video scene data or None if not found
         """
         try:
-            # Get project reference
-            _, project_ref, _ = get_session_refs_by_ids(user_id=user_id, project_id=project_id)
-            
             # Extract video filename for key
-            video_filename = Path(video_uri).name
-            
-            # Get project document
-            project_doc = project_ref.get()
-            if not project_doc.exists:
+            video_filename = _basename(video_uri)
+            
+            # Get project document - only this video's entry when fetching here
+            if project_data is None:
+                project_data = cls.fetch_project_data(
+                    user_id=user_id, project_id=project_id, field_paths=[cls._video_field_path(video_filename)]
+                )
+            if project_data is None:
                 logger.warning(f"[VIDEO_SCENES_STORAGE] Project {project_id} not found")
                 return None
             
-            project_data = project_doc.to_dict()
-            
             # Check if video scenes classification exists
             if cls.VIDEO_SCENES_CLASSIFICATION_KEY not in project_data:
                 logger.warning(f"[VIDEO_SCENES_STORAGE] No video scenes classification found in project {project_id}")
@@ -133,28 +243,26 @@ class VideoScenesStorage:
             return None
     
     @classmethod
-    def list_classified_videos(cls, user_id: str, project_id: str) -> List[str]:
+    def list_classified_videos(cls, user_id: str, project_id: str,
+                               project_data: Optional[Dict[str, Any]] = None) -> List[str]:
         """
         List all videos that have scene classifications in this project.
         
         Args:
             user_id: User ID
             project_id: Project ID
+            project_data: Project document from fetch_project_data, fetched here if not given
             
         Returns:
             List of video filenames that have classifications
         """
         try:
-            # Get project reference
-            _, project_ref, _ = get_session_refs_by_ids(user_id=user_id, project_id=project_id)
-            
             # Get project document
-            project_doc = project_ref.get()
-            if not project_doc.exists:
+            if project_data is None:
+                project_data = cls.fetch_project_data(user_id=user_id, project_id=project_id)
+            if project_data is None:
                 return []
             
-            project_data = project_doc.to_dict()
-            
             # Check if video scenes classification exists
             if cls.VIDEO_SCENES_CLASSIFICATION_KEY not in project_data:
                 return []
@@ -177,41 +285,29 @@ class VideoScenesStorage:
             video_uri: GCS URI of the video to delete
             
         Returns:
-            bool: True if deletion successful, False otherwise
+            bool: True if deletion successful (or nothing was stored for the video), False otherwise
         """
         try:
-            # Get project reference
-            _, project_ref, _ = get_session_refs_by_ids(user_id=user_id, project_id=project_id)
-            
             # Extract video filename for key
-            video_filename = Path(video_uri).name
+            video_filename = _basename(video_uri)
             
-            # Get existing data
-            project_doc = project_ref.get()
-            if not project_doc.exists:
-                logger.warning(f"[VIDEO_SCENES_STORAGE] Project {project_id} not found")
-                return False
-            
-            project_data = project_doc.to_dict()
+            if unified_db_manager.is_postgresql_active():
+                if not cls._write_videos_postgresql(user_id, project_id, deleted_video=video_filename):
+                    logger.error(f"[VIDEO_SCENES_STORAGE] Failed to delete scene classification for {video_filename}")
+                    return False
+                logger.info(f"[VIDEO_SCENES_STORAGE] Deleted scene classification for {video_filename}")
+                return True
             
-            # Check if video scenes classification exists
-            if cls.VIDEO_SCENES_CLASSIFICATION_KEY not in project_data:
-                logger.warning(f"[VIDEO_SCENES_STORAGE] No video scenes classification found in project {project_id}")
-                return False
-            
-            videos_data = project_data[cls.VIDEO_SCENES_CLASSIFICATION_KEY].get("videos", {})
+            # Get project reference
+            _, project_ref, _ = get_session_refs_by_ids(user_id=user_id, project_id=project_id)
             
-            # Check if specific video exists
-            if video_filename not in videos_data:
-                logger.warning(f"[VIDEO_SCENES_STORAGE] No scene classification found for video {video_filename}")
+            # Remove just this video's entry - deleting a missing field is a no-op, so no read needed
+            try:
+                project_ref.update({cls._video_field_path(video_filename): firestore.DELETE_FIELD})
+            except NotFound:
+                logger.warning(f"[VIDEO_SCENES_STORAGE] Project {project_id} not found")
                 return False
             
-            # Remove video from data
-            del videos_data[video_filename]
-            
-            # Update project document
-            project_ref.set({cls.VIDEO_SCENES_CLASSIFICATION_KEY: {"videos": videos_data}}, merge=True)
-            
             logger.info(f"[VIDEO_SCENES_STORAGE] Deleted scene classification for {video_filename}")
             return True
             
@@ -220,50 +316,47 @@ class VideoScenesStorage:
             return False
     
     @classmethod
-    def get_project_video_stats(cls, user_id: str, project_id: str) -> Dict[str, Any]:
+    def get_project_video_stats(cls, user_id: str, project_id: str,
+                                project_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Get summary statistics for all video scene classifications in a project.
         
         Args:
             user_id: User ID
             project_id: Project ID
+            project_data: Project document from fetch_project_data, fetched here if not given
             
         Returns:
             Dict with project video classification statistics
         """
         try:
-            # Get project reference
-            _, project_ref, _ = get_session_refs_by_ids(user_id=user_id, project_id=project_id)
-            
             # Get project document
-            project_doc = project_ref.get()
-            if not project_doc.exists:
+            if project_data is None:
+                project_data = cls.fetch_project_data(user_id=user_id, project_id=project_id)
+            if project_data is None:
                 return {"total_videos": 0, "total_scenes": 0, "videos": []}
             
-            project_data = project_doc.to_dict()
-            
             # Check if video scenes classification exists
             if cls.VIDEO_SCENES_CLASSIFICATION_KEY not in project_data:
                 return {"total_videos": 0, "total_scenes": 0, "videos": []}
             
             videos_data = project_data[cls.VIDEO_SCENES_CLASSIFICATION_KEY].get("videos", {})
             
-            # Calculate statistics
-            total_videos = len(videos_data)
-            total_scenes = sum(video_data.get("total_scenes", 0) for video_data in videos_data.values())
-            
-            # Video summaries
+            # Video summaries and statistics in one pass
+            total_scenes = 0
             video_summaries = []
             for video_filename, video_data in videos_data.items():
+                video_scenes = video_data.get("total_scenes", 0)
+                total_scenes += video_scenes
                 video_summaries.append({
                     "filename": video_filename,
-                    "total_scenes": video_data.get("total_scenes", 0),
+                    "total_scenes": video_scenes,
                     "duration": video_data.get("video_duration", 0.0),
                     "processed_at": video_data.get("processed_at")
                 })
             
             return {
-                "total_videos": total_videos,
+                "total_videos": len(videos_data),
                 "total_scenes": total_scenes,
                 "videos": video_summaries
             }
@@ -1,9 +1,15 @@
 from enum import Enum
 from typing import Dict, List, Optional, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
 
 
+class _MediaModel(BaseModel):
+    # Schemas are built on first validation rather than at import - most of these models are only
+    # used by a few code paths (or only via model_construct, which never builds one)
+    model_config = ConfigDict(defer_build=True)
+
+
 class MediaType(Enum):
     IMAGE = "image"
     VIDEO = "video"
@@ -11,13 +17,13 @@ class MediaType(Enum):
     UNKNOWN = "unknown"
 
 
-class ImageMedia(BaseModel):
+class ImageMedia(_MediaModel):
     uri: str
     file_size_mb: Optional[float] = None
     dimensions: Optional[tuple[int, int]] = None
 
 
-class VideoMedia(BaseModel):
+class VideoMedia(_MediaModel):
     uri: str
     duration: Optional[float] = None
     fps: Optional[float] = None
@@ -26,7 +32,7 @@ class VideoMedia(BaseModel):
     has_audio: Optional[bool] = None
 
 
-class SceneClipMedia(BaseModel):
+class SceneClipMedia(_MediaModel):
     uri: str
     source_video_uri: str
     start_time: float
@@ -35,7 +41,7 @@ class SceneClipMedia(BaseModel):
     clip_id: str
 
 
-class MediaInventory(BaseModel):
+class MediaInventory(_MediaModel):
     images: List[ImageMedia] = []
     videos: List[VideoMedia] = []
     scene_clips: List[SceneClipMedia] = []
@@ -53,14 +59,14 @@ class MediaInventory(BaseModel):
         return media_types > 1
 
 
-class Keyframe(BaseModel):
+class Keyframe(_MediaModel):
     uri: str  # GCS path to extracted frame image
     timestamp: float  # Time in video
     position: int  # 0=beginning, 1=middle, 2=end
     is_hero_candidate: bool = True
 
 
-class SceneClip(BaseModel):
+class SceneClip(_MediaModel):
     clip_id: str
     source_video_uri: str
     start_time: float
@@ -75,14 +81,14 @@ class SceneClip(BaseModel):
         return self.end_time - self.start_time
 
 
-class ImageClassification(BaseModel):
+class ImageClassification(_MediaModel):
     """Reuse existing image classification structure"""
     category: str
     confidence: float
     labels: List[Dict[str, Any]] = []
 
 
-class ClassifiedSceneClip(BaseModel):
+class ClassifiedSceneClip(_MediaModel):
     clip_id: str
     source_video_uri: str
     start_time: float
@@ -95,11 +101,11 @@ class ClassifiedSceneClip(BaseModel):
     metadata: Dict[str, Any] = {}
 
 
-class VideoBuckets(BaseModel):
+class VideoBuckets(_MediaModel):
     """Similar to ImageBuckets but for video clips"""
     buckets: Dict[str, List["VideoBuckets.Item"]]
     
-    class Item(BaseModel):
+    class Item(_MediaModel):
         clip_id: str
         source_video_uri: str
         start_time: float
@@ -114,7 +120,7 @@ class VideoBuckets(BaseModel):
                 self.duration = self.end_time - self.start_time
 
 
-class VideoIntelligenceLabel(BaseModel):
+class VideoIntelligenceLabel(_MediaModel):
     """Label from Google Video Intelligence API"""
     description: str
     confidence: float
@@ -122,7 +128,7 @@ class VideoIntelligenceLabel(BaseModel):
     end_time: float
 
 
-class VideoScene(BaseModel):
+class VideoScene(_MediaModel):
     """Basic video scene detected by Google Video Intelligence API"""
     scene_id: str
     start_time: float
@@ -133,14 +139,14 @@ class VideoScene(BaseModel):
     confidence_score: float
 
 
-class SceneKeyframe(BaseModel):
+class SceneKeyframe(_MediaModel):
     """Keyframe extracted from a video scene"""
     position: str = Field(..., description="Position in scene: start, middle, end")
     timestamp: float = Field(..., description="Exact timestamp in video")
     gs_url: str = Field(..., description="GCS URL of keyframe image")
 
 
-class EnhancedVideoScene(BaseModel):
+class EnhancedVideoScene(_MediaModel):
     """Enhanced scene with Google Video Intelligence data and keyframe analysis"""
     scene_id: str
     start_time: float
@@ -169,12 +175,12 @@ class EnhancedVideoScene(BaseModel):
     processed_at: Optional[datetime] = None
 
 
-class EnhancedVideoBuckets(BaseModel):
+class EnhancedVideoBuckets(_MediaModel):
     """Enhanced video buckets with Google Video Intelligence integration"""
     buckets: Dict[str, List["EnhancedVideoBuckets.Item"]]
     processing_metadata: Dict[str, Any] = Field(default_factory=dict)
     
-    class Item(BaseModel):
+    class Item(_MediaModel):
         scene_id: str
         source_video_uri: str
         start_time: float
@@ -197,7 +203,7 @@ class EnhancedVideoBuckets(BaseModel):
                 self.duration = self.end_time - self.start_time
 
 
-class VideoIntelligenceResults(BaseModel):
+class VideoIntelligenceResults(_MediaModel):
     """Results from Google Video Intelligence API analysis"""
     video_gs_url: str
     total_scenes: int
@@ -207,7 +213,7 @@ class VideoIntelligenceResults(BaseModel):
     processed_at: datetime = Field(default_factory=datetime.now)
 
 
-class UnifiedClassificationResults(BaseModel):
+class UnifiedClassificationResults(_MediaModel):
     """Results from unified classification of mixed media"""
     images: Optional[Dict[str, Any]] = None  # ImageBuckets as dict
     videos: Optional[Dict[str, Any]] = None  # VideoBuckets as dict
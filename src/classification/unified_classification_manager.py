@@ -1,6 +1,8 @@
 import time
-from typing import Dict, Any, Optional
+from threading import Lock
+from typing import Dict, Any, Optional, Tuple
 from logger import logger
+from config.config import settings
 from classification.image_classification_manager import ImageClassificationManager
 from classification.video_classification_manager import VideoClassificationManager
 from classification.media_detector import MediaTypeDetector
@@ -20,6 +22,38 @@ class UnifiedClassificationManager:
         self.media_detector = MediaTypeDetector()
         self.image_classifier = ImageClassificationManager()  # Existing image classification
         self.video_classifier = VideoClassificationManager()  # Enhanced video classification with hierarchical room priority system
+        # (user_id, project_id) -> (monotonic timestamp, inventory); a "check then classify" flow lists the repos once
+        self._inventory_cache: Dict[Tuple[str, str], Tuple[float, MediaInventory]] = {}
+        self._inventory_cache_lock = Lock()
+    
+    def _get_media_inventory(self, user_id: str, project_id: str) -> MediaInventory:
+        """
+        Analyze project media, reusing an inventory analyzed within the last INVENTORY_CACHE_TTL seconds
+        
+        Args:
+            user_id: User ID
+            project_id: Project ID
+            
+        Returns:
+            MediaInventory for the project
+        """
+        key = (user_id, project_id)
+        ttl = settings.Classification.INVENTORY_CACHE_TTL
+        with self._inventory_cache_lock:
+            cached = self._inventory_cache.get(key)
+            if cached and time.monotonic() - cached[0] < ttl:
+                logger.debug(f"[UNIFIED_CLASSIFIER] Reusing media inventory for project {project_id}")
+                return cached[1]
+        
+        media_inventory = self.media_detector.analyze_project_media(user_id, project_id)
+        
+        with self._inventory_cache_lock:
+            now = time.monotonic()
+            # Drop expired entries so a long-lived manager doesn't accumulate inventories
+            for stale_key in [k for k, (ts, _) in self._inventory_cache.items() if now - ts >= ttl]:
+                del self._inventory_cache[stale_key]
+            self._inventory_cache[key] = (now, media_inventory)
+        return media_inventory
     
     def classify_project_media(self, user_id: str, project_id: str) -> UnifiedClassificationResults:
         """
@@ -38,7 +72,7 @@ class UnifiedClassificationManager:
             start_time = time.time()
             
             # Step 1: Analyze media inventory
-            media_inventory = self.media_detector.analyze_project_media(user_id, project_id)
+            media_inventory = self._get_media_inventory(user_id, project_id)
             
             if media_inventory.total_media_count == 0:
                 logger.info(f"[UNIFIED_CLASSIFIER] No media found for project {project_id} - this is normal for newly created projects")
@@ -143,9 +177,9 @@ class UnifiedClassificationManager:
             # Combine videos and scene clips for processing
             all_videos = media_inventory.videos.copy()
             
-            # Convert scene clips to VideoMedia objects for processing if needed
+            # Convert scene clips to VideoMedia objects for processing if needed (fields are already typed)
             for scene_clip in media_inventory.scene_clips:
-                video_media = VideoMedia(
+                video_media = VideoMedia.model_construct(
                     uri=scene_clip.uri,
                     duration=scene_clip.duration
                 )
@@ -182,19 +216,14 @@ class UnifiedClassificationManager:
         logger.info(f"[UNIFIED_CLASSIFIER] Creating unified buckets for mixed media")
         
         try:
-            unified_buckets = {}
-            
             # Get categories from the classification model
             categories = self.image_classifier.model.categories
             
             # Initialize unified buckets for each category
-            for category in categories:
-                unified_buckets[category] = {
-                    "images": [],
-                    "video_clips": [],
-                    "total_items": 0,
-                    "combined_score": 0.0
-                }
+            unified_buckets = {
+                category: {"images": [], "video_clips": [], "total_items": 0, "combined_score": 0.0}
+                for category in categories
+            }
             
             # This is a simplified implementation
             # In a full implementation, we would:
@@ -231,7 +260,7 @@ class UnifiedClassificationManager:
             True if classification should run, False otherwise
         """
         try:
-            media_inventory = self.media_detector.analyze_project_media(user_id, project_id)
+            media_inventory = self._get_media_inventory(user_id, project_id)
             
             if media_inventory.total_media_count == 0:
                 logger.info(f"[UNIFIED_CLASSIFIER] No media found for project {project_id} - skipping classification")
@@ -262,7 +291,7 @@ class UnifiedClassificationManager:
             Dictionary with classification status information
         """
         try:
-            media_inventory = self.media_detector.analyze_project_media(user_id, project_id)
+            media_inventory = self._get_media_inventory(user_id, project_id)
             media_stats = self.media_detector.get_media_stats(media_inventory)
             
             return {
@@ -8,6 +8,8 @@ import os
 import json
 import time
 import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 from pathlib import Path
@@ -98,45 +100,68 @@ class VideoClassificationManager:
         }
         
         start_time = time.time()
+        summary_lock = threading.Lock()
+        video_scenes_by_uri = {}  # Stored together once every video is done
         
-        try:
-            for video in videos:
-                logger.info(f"[ENHANCED_VIDEO_CLASSIFIER] Processing video: {video.uri}")
-                video_start_time = time.time()
-                
-                # Step 1: Analyze video with Google Video Intelligence API
-                raw_results = self.analyze_video_raw_labels(video.uri)
-                if not raw_results or not raw_results.get("frame_labels"):
-                    logger.warning(f"[ENHANCED_VIDEO_CLASSIFIER] No labels detected for video: {video.uri}")
-                    continue
-                
-                # Step 2: Apply enhanced scene detection with hierarchical room priority
-                final_scenes = self._apply_enhanced_scene_detection(
-                    raw_results["frame_labels"], 
-                    raw_results["video_duration"]
-                )
-                
-                if not final_scenes:
-                    logger.warning(f"[ENHANCED_VIDEO_CLASSIFIER] No scenes survived enhanced detection for video: {video.uri}")
-                    continue
-                
-                # Step 3: Store enhanced scene classifications using new storage system
-                success = self._store_video_scene_classification_new(
-                    user_id, project_id, video.uri, final_scenes, raw_results
-                )
-                
-                # Update processing summary
+        def process_video(video: VideoMedia, operation) -> None:
+            video_start_time = time.time()
+            
+            # Step 1: Collect the Google Video Intelligence API results
+            raw_results = self._collect_video_annotation(video.uri, operation)
+            if not raw_results or not raw_results.get("frame_labels"):
+                logger.warning(f"[ENHANCED_VIDEO_CLASSIFIER] No labels detected for video: {video.uri}")
+                return
+            
+            # Step 2: Apply enhanced scene detection with hierarchical room priority
+            final_scenes = self._apply_enhanced_scene_detection(
+                raw_results["frame_labels"], 
+                raw_results["video_duration"]
+            )
+            
+            if not final_scenes:
+                logger.warning(f"[ENHANCED_VIDEO_CLASSIFIER] No scenes survived enhanced detection for video: {video.uri}")
+                return
+            
+            # Step 3: Queue enhanced scene classifications for the new storage system
+            video_scenes_data = self._build_video_scenes_data(video.uri, final_scenes, raw_results)
+            
+            video_processing_time = time.time() - video_start_time
+            
+            # Update processing summary
+            with summary_lock:
+                video_scenes_by_uri[video.uri] = video_scenes_data
                 processing_summary["total_videos_processed"] += 1
                 processing_summary["total_scenes_detected"] += len(final_scenes)
                 processing_summary["videos_processed"].append({
                     "video_uri": video.uri,
                     "scenes_detected": len(final_scenes),
-                    "processing_time": time.time() - video_start_time,
-                    "storage_success": success
+                    "processing_time": video_processing_time,
+                    "storage_success": False
                 })
+            
+            logger.info(f"[ENHANCED_VIDEO_CLASSIFIER] Completed video {video.uri} in {video_processing_time:.2f}s with {len(final_scenes)} scenes")
+        
+        try:
+            try:
+                # Phase 1: submit every long-running annotation up front so the API works on all videos at once
+                operations = []
+                for video in videos:
+                    logger.info(f"[ENHANCED_VIDEO_CLASSIFIER] Processing video: {video.uri}")
+                    operations.append((video, self._submit_video_annotation(video.uri)))
                 
-                video_processing_time = time.time() - video_start_time
-                logger.info(f"[ENHANCED_VIDEO_CLASSIFIER] Completed video {video.uri} in {video_processing_time:.2f}s with {len(final_scenes)} scenes")
+                # Phase 2: wait on the operations and run scene detection concurrently
+                if operations:
+                    max_workers = min(len(operations), settings.Classification.MAX_CONCURRENT_VIDEOS)
+                    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='video-classification') as executor:
+                        futures = [executor.submit(process_video, video, operation) for video, operation in operations]
+                        for future in futures:
+                            future.result()
+            
+            finally:
+                # Phase 3: store the scene classifications of every finished video in one Firestore write - also
+                # when another video failed (the executor has let the in-flight videos finish by now), so its
+                # error doesn't discard them
+                self._store_processed_videos(user_id, project_id, video_scenes_by_uri, processing_summary)
         
         except Exception as e:
             logger.error(f"[ENHANCED_VIDEO_CLASSIFIER] Classification failed: {e}")
@@ -148,6 +173,21 @@ class VideoClassificationManager:
         
         return processing_summary
     
+    def _store_processed_videos(self, user_id: str, project_id: str, video_scenes_by_uri: Dict[str, Dict[str, Any]],
+                                processing_summary: Dict[str, Any]) -> None:
+        """
+        Store the scene classifications of the processed videos and record the outcome in the processing summary.
+        """
+        if not video_scenes_by_uri:
+            return
+        
+        success = VideoScenesStorage.store_multiple_video_scenes(user_id, project_id, video_scenes_by_uri)
+        if not success:
+            logger.error(f"[ENHANCED_VIDEO_CLASSIFIER] Failed to store scene classifications for {len(video_scenes_by_uri)} videos")
+        for video_summary in processing_summary["videos_processed"]:
+            if video_summary["video_uri"] in video_scenes_by_uri:
+                video_summary["storage_success"] = success
+    
     def analyze_video_raw_labels(self, video_uri: str) -> Dict[str, Any]:
         """
         Analyze video with Google Video Intelligence API and return raw results.
@@ -159,6 +199,12 @@ class VideoClassificationManager:
         Returns:
             Dictionary containing raw API results
         """
+        return self._collect_video_annotation(video_uri, self._submit_video_annotation(video_uri))
+    
+    def _submit_video_annotation(self, video_uri: str):
+        """
+        Start the Video Intelligence long-running annotation for a video and return its operation.
+        """
         logger.info(f"[ENHANCED_VIDEO_CLASSIFIER] Analyzing video with Google Video Intelligence API: {video_uri}")
         
         # Configure Video Intelligence API request (same as successful test)
@@ -180,14 +226,18 @@ class VideoClassificationManager:
         }
 
         # Make the API request
-        operation = self.video_intelligence_client.annotate_video(
+        return self.video_intelligence_client.annotate_video(
             request={
                 "input_uri": video_uri,
                 "features": features,
                 "video_context": video_context
             }
         )
-
+    
+    def _collect_video_annotation(self, video_uri: str, operation) -> Dict[str, Any]:
+        """
+        Wait for a submitted annotation operation and structure its raw results.
+        """
         logger.info(f"[ENHANCED_VIDEO_CLASSIFIER] Processing video with Google Video Intelligence API...")
         result = operation.result(timeout=600)  # 10 minute timeout
 
@@ -654,6 +704,25 @@ class VideoClassificationManager:
         
         return final_scenes
     
+    def _build_video_scenes_data(self, video_uri: str, final_scenes: List[Dict[str, Any]],
+                                 raw_results: Dict[str, Any]) -> Dict[str, Any]:
+        """Create video scene data following the new storage pattern"""
+        return {
+            "video_uri": video_uri,
+            "video_duration": raw_results["video_duration"],
+            "total_scenes": len(final_scenes),
+            "scenes": final_scenes,
+            "processing_metadata": {
+                "api_model": "builtin/stable",
+                "processing_time": raw_results.get("processing_time", 0),
+                "enhanced_detection": True,
+                "room_priority_system": True,
+                "total_frame_labels": len(raw_results.get("frame_labels", [])),
+                "total_segment_labels": len(raw_results.get("segment_labels", []))
+            },
+            "processed_at": datetime.utcnow().isoformat()
+        }
+    
     def _store_video_scene_classification_new(self, user_id: str, project_id: str, video_uri: str, 
                                             final_scenes: List[Dict[str, Any]], raw_results: Dict[str, Any]) -> bool:
         """
@@ -664,22 +733,7 @@ class VideoClassificationManager:
             bool: True if storage successful, False otherwise
         """
         try:
-            # Create video scene data following the new pattern
-            video_scenes_data = {
-                "video_uri": video_uri,
-                "video_duration": raw_results["video_duration"],
-                "total_scenes": len(final_scenes),
-                "scenes": final_scenes,
-                "processing_metadata": {
-                    "api_model": "builtin/stable",
-                    "processing_time": raw_results.get("processing_time", 0),
-                    "enhanced_detection": True,
-                    "room_priority_system": True,
-                    "total_frame_labels": len(raw_results.get("frame_labels", [])),
-                    "total_segment_labels": len(raw_results.get("segment_labels", []))
-                },
-                "processed_at": datetime.utcnow().isoformat()
-            }
+            video_scenes_data = self._build_video_scenes_data(video_uri, final_scenes, raw_results)
             
             # Store using the new storage manager
             success = VideoScenesStorage.store_video_scenes(
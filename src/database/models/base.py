@@ -1,9 +1,13 @@
 from datetime import datetime
 from typing import Any, Dict
 from sqlalchemy import Column, String, DateTime, JSON, func
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.ext.declarative import declared_attr
 
+# JSON columns are stored as binary JSONB on PostgreSQL (no re-parse on read, GIN indexable)
+JSONType = JSON().with_variant(JSONB(), 'postgresql')
+
 
 class BaseModel:
     """Base model with common fields and methods"""
@@ -18,7 +22,7 @@ class BaseModel:
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
     
     # Metadata field to store additional Firestore-like data
-    metadata = Column(JSON, default=dict)
+    metadata = Column(JSONType, default=dict)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert model to dictionary (similar to Firestore document)"""
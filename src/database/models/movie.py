@@ -1,6 +1,6 @@
-from sqlalchemy import Column, String, Text, JSON, DateTime, ForeignKey, Float, Integer, Boolean
+from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Float, Integer, Boolean
 from sqlalchemy.orm import relationship
-from database.models.base import Base
+from database.models.base import Base, JSONType
 
 
 class Movie(Base):
@@ -29,28 +29,28 @@ class Movie(Base):
     
     # Template and style information
     template_id = Column(String, nullable=True)
-    template_data = Column(JSON, default=dict)  # Template configuration used
-    edl_data = Column(JSON, default=dict)  # Edit Decision List data
+    template_data = Column(JSONType, default=dict)  # Template configuration used
+    edl_data = Column(JSONType, default=dict, server_default='{}', nullable=False)  # Edit Decision List data
     
     # Audio and voiceover
     has_voiceover = Column(Boolean, default=False, nullable=False)
-    voiceover_config = Column(JSON, default=dict)  # Voiceover settings and metadata
-    background_music = Column(JSON, default=dict)  # Background music configuration
-    audio_levels = Column(JSON, default=dict)  # Audio level settings
+    voiceover_config = Column(JSONType, default=dict)  # Voiceover settings and metadata
+    background_music = Column(JSONType, default=dict)  # Background music configuration
+    audio_levels = Column(JSONType, default=dict)  # Audio level settings
     
     # Visual elements
-    captions_config = Column(JSON, default=dict)  # Caption settings
-    effects_config = Column(JSON, default=dict)  # Visual effects configuration
-    watermark_config = Column(JSON, default=dict)  # Watermark settings
+    captions_config = Column(JSONType, default=dict)  # Caption settings
+    effects_config = Column(JSONType, default=dict)  # Visual effects configuration
+    watermark_config = Column(JSONType, default=dict)  # Watermark settings
     
     # File locations and URLs
     output_url = Column(Text, nullable=True)  # Final movie URL
     preview_url = Column(Text, nullable=True)  # Preview/thumbnail URL
-    source_files = Column(JSON, default=list)  # Array of source file URLs
+    source_files = Column(JSONType, default=list)  # Array of source file URLs
     
     # Processing metadata
-    processing_log = Column(JSON, default=list)  # Array of processing steps
-    error_log = Column(JSON, default=list)  # Array of errors encountered
+    processing_log = Column(JSONType, default=list)  # Array of processing steps
+    error_log = Column(JSONType, default=list)  # Array of errors encountered
     
     # Timing information
     started_at = Column(DateTime, nullable=True)
@@ -58,7 +58,7 @@ class Movie(Base):
     render_time = Column(Float, nullable=True)  # Render time in seconds
     
     # Quality and optimization
-    quality_settings = Column(JSON, default=dict)  # Quality and compression settings
+    quality_settings = Column(JSONType, default=dict)  # Quality and compression settings
     file_size = Column(Integer, nullable=True)  # File size in bytes
     
     # Relationships
@@ -1,6 +1,6 @@
-from sqlalchemy import Column, String, Text, JSON, Boolean, DateTime, ForeignKey, Integer
+from sqlalchemy import Column, String, Text, Boolean, DateTime, ForeignKey, Integer
 from sqlalchemy.orm import relationship
-from database.models.base import Base
+from database.models.base import Base, JSONType
 
 
 class Project(Base):
@@ -14,11 +14,11 @@ class Project(Base):
     
     # Project configuration
     status = Column(String, default="active", nullable=False)  # active, archived, deleted
-    settings = Column(JSON, default=dict)  # Project-specific settings
+    settings = Column(JSONType, default=dict, server_default='{}', nullable=False)  # Project-specific settings
     
     # Template and style information
     template_id = Column(String, nullable=True)
-    style_preferences = Column(JSON, default=dict)
+    style_preferences = Column(JSONType, default=dict)
     
     # Relationships
     versions = relationship("ProjectVersion", back_populates="project", cascade="all, delete-orphan")
@@ -40,11 +40,11 @@ class ProjectVersion(Base):
     is_current = Column(Boolean, default=False, nullable=False)
     
     # Version configuration
-    configuration = Column(JSON, default=dict)
-    processing_log = Column(JSON, default=list)  # Array of processing steps/logs
+    configuration = Column(JSONType, default=dict, server_default='{}', nullable=False)
+    processing_log = Column(JSONType, default=list)  # Array of processing steps/logs
     
     # Output information
-    output_urls = Column(JSON, default=dict)  # Generated video URLs, thumbnails, etc.
+    output_urls = Column(JSONType, default=dict)  # Generated video URLs, thumbnails, etc.
     
     # Relationships
     project = relationship("Project", back_populates="versions")
@@ -1,6 +1,6 @@
-from sqlalchemy import Column, String, Text, JSON, Boolean, DateTime, ForeignKey, Float, Integer
+from sqlalchemy import Column, String, Text, Boolean, DateTime, ForeignKey, Float, Integer
 from sqlalchemy.orm import relationship
-from database.models.base import Base
+from database.models.base import Base, JSONType
 
 
 class Property(Base):
@@ -20,7 +20,7 @@ class Property(Base):
     longitude = Column(Float, nullable=True)
     
     # Address components (from Google Places API)
-    address_components = Column(JSON, default=dict)
+    address_components = Column(JSONType, default=dict)
     
     # Property details
     title = Column(String, nullable=True)
@@ -52,17 +52,17 @@ class Property(Base):
     last_updated = Column(DateTime, nullable=True)
     
     # Media and assets
-    images = Column(JSON, default=list)  # Array of image URLs/paths
-    videos = Column(JSON, default=list)  # Array of video URLs/paths
-    virtual_tours = Column(JSON, default=list)  # Virtual tour URLs
+    images = Column(JSONType, default=list)  # Array of image URLs/paths
+    videos = Column(JSONType, default=list)  # Array of video URLs/paths
+    virtual_tours = Column(JSONType, default=list)  # Virtual tour URLs
     
     # Classification and AI analysis
-    classification_data = Column(JSON, default=dict)  # AI classification results
-    image_analysis = Column(JSON, default=dict)  # Image analysis results
+    classification_data = Column(JSONType, default=dict, server_default='{}', nullable=False)  # AI classification results
+    image_analysis = Column(JSONType, default=dict)  # Image analysis results
     
     # Additional property features and amenities
-    features = Column(JSON, default=list)  # Array of property features
-    amenities = Column(JSON, default=list)  # Array of amenities
+    features = Column(JSONType, default=list)  # Array of property features
+    amenities = Column(JSONType, default=list)  # Array of amenities
     
     # Relationships
     project = relationship("Project", back_populates="properties")
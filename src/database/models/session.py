@@ -1,6 +1,6 @@
-from sqlalchemy import Column, String, Text, JSON, DateTime, ForeignKey, Integer
+from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Integer
 from sqlalchemy.orm import relationship
-from database.models.base import Base
+from database.models.base import Base, JSONType
 
 
 class Session(Base):
@@ -21,12 +21,12 @@ class Session(Base):
     progress_percentage = Column(Integer, default=0, nullable=False)
     
     # Session configuration and parameters
-    configuration = Column(JSON, default=dict)  # Session-specific settings
-    input_parameters = Column(JSON, default=dict)  # Input parameters for processing
+    configuration = Column(JSONType, default=dict, server_default='{}', nullable=False)  # Session-specific settings
+    input_parameters = Column(JSONType, default=dict)  # Input parameters for processing
     
     # Processing information
-    processing_log = Column(JSON, default=list)  # Array of processing steps and logs
-    error_log = Column(JSON, default=list)  # Array of errors encountered
+    processing_log = Column(JSONType, default=list)  # Array of processing steps and logs
+    error_log = Column(JSONType, default=list)  # Array of errors encountered
     
     # Timing information
     started_at = Column(DateTime, nullable=True)
@@ -34,8 +34,8 @@ class Session(Base):
     estimated_completion = Column(DateTime, nullable=True)
     
     # Output and results
-    output_data = Column(JSON, default=dict)  # Session output data
-    generated_assets = Column(JSON, default=list)  # Array of generated asset URLs/paths
+    output_data = Column(JSONType, default=dict)  # Session output data
+    generated_assets = Column(JSONType, default=list)  # Array of generated asset URLs/paths
     
     # Relationships
     project = relationship("Project", back_populates="sessions")
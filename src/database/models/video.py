@@ -1,6 +1,6 @@
-from sqlalchemy import Column, String, Text, JSON, DateTime, ForeignKey, Float, Integer, Boolean
+from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Float, Integer, Boolean
 from sqlalchemy.orm import relationship
-from database.models.base import Base
+from database.models.base import Base, JSONType
 
 
 class Video(Base):
@@ -49,23 +49,23 @@ class Video(Base):
     
     # Classification and analysis
     is_classified = Column(Boolean, default=False, nullable=False)
-    classification_data = Column(JSON, default=dict)  # AI classification results
-    keyframes = Column(JSON, default=list)  # Array of keyframe URLs/timestamps
+    classification_data = Column(JSONType, default=dict, server_default='{}', nullable=False)  # AI classification results
+    keyframes = Column(JSONType, default=list)  # Array of keyframe URLs/timestamps
     
     # Quality and technical metadata
     quality_score = Column(Float, nullable=True)  # Quality assessment score
-    technical_metadata = Column(JSON, default=dict)  # Technical video metadata
+    technical_metadata = Column(JSONType, default=dict, server_default='{}', nullable=False)  # Technical video metadata
     
     # Processing configuration
-    processing_config = Column(JSON, default=dict)  # Processing parameters used
-    scene_detection_config = Column(JSON, default=dict)  # Scene detection settings
+    processing_config = Column(JSONType, default=dict)  # Processing parameters used
+    scene_detection_config = Column(JSONType, default=dict)  # Scene detection settings
     
     # Upload and processing timing
     uploaded_at = Column(DateTime, nullable=True)
     processed_at = Column(DateTime, nullable=True)
     
     # Error handling
-    processing_errors = Column(JSON, default=list)  # Array of processing errors
+    processing_errors = Column(JSONType, default=list)  # Array of processing errors
     
     # Relationships
     session = relationship("Session", back_populates="videos")
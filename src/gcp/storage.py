@@ -440,23 +440,6 @@ class StorageManager():
         
     @staticmethod
     def load_blobs(cloud_path:CloudPath, dest_dir:Path, excluded_files:list[str]=None)->dict:
-        def _mapping(cloud_path:CloudPath, dest_dir:Path)->tuple[dict, dict]:
-            l2c_mapping = {}
-            c2l_mapping = {}
-            bucket = cloud_storage_client.bucket(cloud_path.bucket_id)
-            prefix = f"{cloud_path.path}/"
-            blobs = bucket.list_blobs(prefix=prefix, delimiter='/')
-            for blob in blobs:
-                gs_url = f'gs://{cloud_path.bucket_id}/{blob.name}'
-                if excluded_files and gs_url in excluded_files:
-                    continue
-                # Construct the local file path
-                local_file_path = os.path.join(str(dest_dir), Path(blob.name).name)
-                # Add to the mapping
-                l2c_mapping[local_file_path] = gs_url
-                c2l_mapping[gs_url] = local_file_path
-            return l2c_mapping, c2l_mapping
-                
         try:
             bucket = cloud_storage_client.bucket(cloud_path.bucket_id)
             if not bucket:
@@ -464,23 +447,39 @@ class StorageManager():
             
             prefix = f"{cloud_path.path}/"
             blobs = [blob for blob in bucket.list_blobs(prefix=prefix, delimiter='/') if not blob.name.endswith('/')]
-            if excluded_files:
-                filtered_blobs = []
-                for blob in blobs:
-                    gs_url = f'gs://{cloud_path.bucket_id}/{blob.name}'
-                    if not gs_url in excluded_files:
-                        filtered_blobs.append(blob)
-            else:
-                filtered_blobs = blobs
+            excluded = set(excluded_files) if excluded_files else set()
+            
+            # Build the mappings from the same listing used for the download - no second list RPC
+            l2c_mapping = {}
+            c2l_mapping = {}
+            blob_names = []
+            for blob in blobs:
+                gs_url = f'gs://{cloud_path.bucket_id}/{blob.name}'
+                if gs_url in excluded:
+                    continue
+                blob_name = Path(blob.name).name
+                local_file_path = os.path.join(str(dest_dir), blob_name)
+                l2c_mapping[local_file_path] = gs_url
+                c2l_mapping[gs_url] = local_file_path
+                blob_names.append(blob_name)
 
-            _ = transfer_manager.download_many_to_path(
+            results = transfer_manager.download_many_to_path(
                 bucket=bucket, 
-                blob_names=[Path(blob.name).name for blob in filtered_blobs], 
+                blob_names=blob_names, 
                 destination_directory=dest_dir, 
-                blob_name_prefix=prefix
+                blob_name_prefix=prefix,
+                max_workers=settings.GCP.Storage.DOWNLOAD_MAX_WORKERS,
+                worker_type=transfer_manager.THREAD
             )
+            
+            # Only map files that were fully downloaded - callers use the mapping as the file list
+            for blob_name, result in zip(blob_names, results):
+                if isinstance(result, Exception):
+                    logger.warning(f"Failed to download '{prefix}{blob_name}' from bucket '{cloud_path.bucket_id}': {result}")
+                    local_file_path = os.path.join(str(dest_dir), blob_name)
+                    c2l_mapping.pop(l2c_mapping.pop(local_file_path), None)
         
-            return _mapping(cloud_path=cloud_path, dest_dir=dest_dir)
+            return l2c_mapping, c2l_mapping
         
         except Exception as e:
             raise e
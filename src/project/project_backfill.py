@@ -10,6 +10,7 @@ from google.cloud.firestore_v1.document import DocumentReference
 from config.config import settings
 from logger import logger
 from utils.session_utils import get_session_refs_by_ids
+from database.db_manager import unified_db_manager
 from classification.classification_model import ImageBuckets
 from utils.common_models import ActionStatus
 
@@ -24,6 +25,14 @@ PROJECT_VERSION_ACTIVE_STATS_KEY = 'active'
 PROJECT_THUMBNAIL_INFO_KEY = 'thumbnail'
 PROJECT_MEDIA_SIGNED_URLS_KEY = 'media_signed_urls'
 
+# Lowercased ActionStatus.State value -> version stats counter (State matching is case-insensitive)
+_VERSION_STATE_COUNT_KEYS = {
+    ActionStatus.State.SUCCESS.value.lower(): 'success',
+    ActionStatus.State.FAILURE.value.lower(): 'failure',
+    ActionStatus.State.PENDING.value.lower(): 'pending',
+}
+_VERSION_STATS_FIELDS = ['status.state', 'viewed', 'is_deleted']
+
 # --- Property ID Backfill Functions ---
 def derive_property_id(project_ref: DocumentReference) -> str:
     """
@@ -108,40 +117,37 @@ def derive_version_stats(project_ref: DocumentReference):
     if not project_ref:
         raise ValueError("Project ID & document reference are required to derive version stats.")
 
-    success_count = 0
-    failure_count = 0
-    pending_count = 0
+    state_counts = dict.fromkeys(_VERSION_STATE_COUNT_KEYS.values(), 0)
     unviewed_count = 0
     active_count = 0
     deleted_count = 0
 
     versions_ref = project_ref.collection(settings.GCP.Firestore.VERSIONS_COLLECTION_NAME)
     try:
+        # Project only the fields counted below - version docs also carry the full request & story.
+        # The PostgreSQL compatibility refs have no projection
+        if not unified_db_manager.is_postgresql_active():
+            versions_ref = versions_ref.select(_VERSION_STATS_FIELDS)
         for vdoc in versions_ref.stream():
             version = vdoc.to_dict()
+            is_deleted = version.get('is_deleted', False)
             
-            if version.get('is_deleted', False):
+            if is_deleted:
                 deleted_count += 1
             else:
                 active_count += 1
-                
-            status = ActionStatus.model_validate(version.get('status'))
-            if status.state == ActionStatus.State.SUCCESS:
-                success_count += 1
-                viewed = version.get('viewed', False)
-                if not viewed and not version.get('is_deleted', False):
-                    unviewed_count += 1 
-            elif status.state == ActionStatus.State.PENDING:
-                pending_count += 1
-            elif status.state == ActionStatus.State.FAILURE:
-                failure_count += 1
+            
+            # Only `status.state` is needed - a plain lookup instead of validating ActionStatus
+            state = ((version.get('status') or {}).get('state') or '').lower()
+            count_key = _VERSION_STATE_COUNT_KEYS.get(state)
+            if count_key is None:
+                continue
+            state_counts[count_key] += 1
+            if count_key == 'success' and not version.get('viewed', False) and not is_deleted:
+                unviewed_count += 1
 
         version_stats_dict = {
-            PROJECT_VERSION_STATE_STATS_KEY: {
-                'success': success_count,
-                'failure': failure_count,
-                'pending': pending_count    
-            },
+            PROJECT_VERSION_STATE_STATS_KEY: state_counts,
             PROJECT_VERSION_VIEWED_STATS_KEY: {
                 'unviewed_count': unviewed_count
             },
@@ -4,11 +4,17 @@ Provides unified interface for storing classification data in both PostgreSQL an
 """
 
 from typing import Dict, Any, Optional
+from google.api_core.exceptions import ServiceUnavailable
+from google.api_core.retry import Retry, if_exception_type
 from logger import logger
 from database.db_manager import unified_db_manager
 from services.project_service import project_service
 
 
+# Retry the classification patch on transient UNAVAILABLE (gRPC 14) with backoff
+_FIRESTORE_WRITE_RETRY = Retry(predicate=if_exception_type(ServiceUnavailable), timeout=60.0)
+
+
 class ClassificationStorageService:
     """
     Unified classification storage service that abstracts database operations.
@@ -153,7 +159,9 @@ class ClassificationStorageService:
             from utils.session_utils import get_session_refs_by_ids
             
             user_ref, project_ref, _ = get_session_refs_by_ids(user_id, project_id)
-            project_ref.set(results, merge=True)
+            # Single patch of the result fields - each top-level key is replaced as a whole, so a
+            # re-run overwrites the previous buckets instead of deep-merging into them
+            project_ref.update(results, retry=_FIRESTORE_WRITE_RETRY)
             
             logger.info(f"[CLASSIFICATION_SERVICE] Stored classification results in Firestore for project {project_id}")
             return True
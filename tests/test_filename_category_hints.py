@@ -0,0 +1,37 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from classification.image_classification_manager import ImageClassificationManager
+
+def test_category_from_filename():
+    """Test that only unambiguous room words in a filename name its category"""
+    
+    test_cases = [
+        # Room words
+        ("kitchen_02.jpg", "Kitchen"),
+        ("/tmp/project/Master-Bedroom.JPG", "Bedroom"),
+        ("guest_ensuite-1.heic", "Bathroom"),
+        ("floorplan.png", "Plan"),
+        ("front_exterior.jpg", "Exterior"),
+        ("123-Main-Street-Kitchen.jpg", "Kitchen"),
+        # Address and description words are no hint
+        ("123-Main-Street.jpg", None),
+        ("3-bed-2-bath.jpg", None),
+        ("front-deck-garden.jpg", None),
+        ("family-den.jpg", None),
+        ("open-plan-living.jpg", None),
+        ("powder_room.jpg", None),
+        ("pool-and-spa.jpg", None),
+        ("IMG_4821.jpg", None),
+        # Whole words only
+        ("kitchener_ave.jpg", None),
+        ("bedroomsuite.jpg", None),
+        # Words of several categories are ambiguous
+        ("kitchen-to-diningroom.jpg", None),
+        ("kitchen_kitchenette.jpg", "Kitchen"),
+    ]
+    
+    manager = ImageClassificationManager()
+    for filename, expected in test_cases:
+        assert manager.category_from_filename(filename) == expected, filename
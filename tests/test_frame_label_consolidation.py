@@ -0,0 +1,117 @@
+import sys
+import os
+import random
+from collections import defaultdict
+import numpy as np
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from classification.legacy.legacy_video_classification_manager import FrameLabelsSoA, VideoClassificationManager
+
+VIDEO_DURATION = 30.0
+
+def _consolidate_frame_dicts(filtered_scenes, video_duration):
+    # The per-frame dict consolidation FrameLabelsSoA replaced
+    time_windows = defaultdict(list)
+    for scene in filtered_scenes:
+        time_windows[int(scene['time_offset'])].append(scene)
+    
+    consolidated_frames = []
+    for scenes_at_time in time_windows.values():
+        scenes_at_time.sort(key=lambda x: (x['priority'], -x['confidence']))
+        consolidated_frames.append(scenes_at_time[0])
+    
+    scene_groups = defaultdict(list)
+    for frame in consolidated_frames:
+        scene_groups[frame['description']].append(frame)
+    
+    consolidated_scenes = []
+    for description, frames in scene_groups.items():
+        frames.sort(key=lambda x: x['time_offset'])
+        start_time = frames[0]['time_offset']
+        end_time = frames[-1]['time_offset']
+        if len(frames) == 1:
+            start_time = max(0, start_time - 2.0)
+            end_time = min(video_duration, end_time + 2.0)
+        avg_confidence = sum(f['confidence'] for f in frames) / len(frames)
+        consolidated_scenes.append({
+            'scene_type': description,
+            'scene_type_lower': frames[0]['description_lower'],
+            'start_time': start_time,
+            'end_time': end_time,
+            'duration': end_time - start_time,
+            'confidence': avg_confidence,
+            'keyframe_timestamp': (start_time + end_time) / 2,
+            'frame_count': len(frames),
+            'priority': frames[0]['priority']
+        })
+    consolidated_scenes.sort(key=lambda x: (x['priority'], -x['confidence']))
+    return consolidated_scenes
+
+def _consolidate_both(labels):
+    """
+    `labels` are (description, priority, [(time_offset, confidence), ...]) in Video Intelligence order
+    """
+    frame_dicts = []
+    descriptions, entity_idx, confidences, time_offsets, priorities = [], [], [], [], []
+    for description, priority, frames in labels:
+        descriptions.append(description)
+        for time_offset, confidence in frames:
+            # Video Intelligence confidences are float32 values
+            confidence = float(np.float32(confidence))
+            frame_dicts.append({
+                'description': description,
+                'description_lower': description.lower(),
+                'confidence': confidence,
+                'time_offset': time_offset,
+                'priority': priority
+            })
+            entity_idx.append(len(descriptions) - 1)
+            confidences.append(confidence)
+            time_offsets.append(time_offset)
+            priorities.append(priority)
+    
+    filtered_scenes = FrameLabelsSoA(
+        descriptions=descriptions,
+        entity_idx=np.array(entity_idx, dtype=np.int32),
+        confidences=np.array(confidences, dtype=np.float32),
+        time_offsets=np.array(time_offsets, dtype=np.float64),
+        priorities=np.array(priorities, dtype=np.int8)
+    )
+    # Consolidation only needs the instance for logging - skip the API clients __init__ builds
+    manager = object.__new__(VideoClassificationManager)
+    return (
+        _consolidate_frame_dicts(frame_dicts, VIDEO_DURATION),
+        manager._consolidate_scenes_by_time_windows(filtered_scenes, VIDEO_DURATION)
+    )
+
+def test_consolidation_matches_frame_dicts():
+    """Test the array consolidation against the per-frame dict one on a fixture with ties"""
+    labels = [
+        # Ties on priority and confidence in a window go to the frame seen first, not the earliest one
+        ('Kitchen', 1, [(0.7, 0.9), (1.5, 0.8), (2.2, 0.8), (14.1, 0.75)]),
+        ('Bedroom', 1, [(0.2, 0.9), (1.1, 0.8), (2.9, 0.85), (20.0, 0.7)]),
+        # Higher confidence loses to a more specific priority
+        ('House', 2, [(1.4, 0.99), (3.3, 0.95), (4.0, 0.9), (28.9, 0.9)]),
+        ('Room', 3, [(3.0, 0.99), (5.5, 0.96), (6.1, 0.97)]),
+        # Many frames - the average is a long sum
+        ('Living room', 1, [(7.0 + i, 0.6 + 0.03 * (i % 5)) for i in range(12)]),
+        # Scenes tied on priority and average confidence keep their group order
+        ('Bathroom', 1, [(22.5, 0.8), (23.5, 0.7)]),
+        ('Patio', 1, [(24.5, 0.7), (25.5, 0.8)]),
+        # Single frames at the ends of the video are clamped when expanded
+        ('Swimming pool', 2, [(29.5, 0.96)]),
+    ]
+    expected, consolidated = _consolidate_both(labels)
+    assert consolidated == expected
+
+def test_consolidation_matches_frame_dicts_random():
+    """Test the array consolidation against the per-frame dict one on random, tie-heavy labels"""
+    rng = random.Random(11)
+    for _ in range(200):
+        labels = []
+        for entity in range(rng.randint(1, 8)):
+            times = sorted(round(rng.uniform(0, VIDEO_DURATION), 1) for _ in range(rng.randint(1, 15)))
+            frames = [(t, rng.choice([0.6, 0.7, 0.75, 0.8, 0.9, rng.uniform(0.6, 1.0)])) for t in times]
+            labels.append((f'Label {entity}', rng.randint(1, 3), frames))
+        expected, consolidated = _consolidate_both(labels)
+        assert consolidated == expected
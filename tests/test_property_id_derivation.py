@@ -0,0 +1,34 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from config.config import settings
+from backfills.property_id_bf import derive_property_id
+
+def _project_dict(uris):
+    return {
+        settings.Classification.IMAGE_CLASSIFICATION_KEY: {
+            'buckets': {'Exterior': [{'uri': uri, 'score': 1} for uri in uris]}
+        }
+    }
+
+def test_derive_property_id():
+    """Test that the property ID comes from the 1st properties bucket URI with a property folder"""
+    gs_bucket = f"gs://{settings.GCP.Storage.PROPERTIES_BUCKET}"
+    
+    test_cases = [
+        ([f"{gs_bucket}/prop-123/photos/1.jpg"], "prop-123"),
+        ([f"{gs_bucket}/prop-123/1.jpg"], "prop-123"),
+        # URIs without a property folder are skipped, not taken as the ID
+        ([f"{gs_bucket}/photo.jpg"], None),
+        ([f"{gs_bucket}/photo.jpg", f"{gs_bucket}/prop-456/1.jpg"], "prop-456"),
+        ([f"{gs_bucket}//1.jpg", f"{gs_bucket}/prop-789/1.jpg"], "prop-789"),
+        # Other buckets
+        (["gs://other-bucket/prop-123/1.jpg"], None),
+        ([f"{gs_bucket}-dev/prop-123/1.jpg"], None),
+        ([], None),
+    ]
+    
+    for uris, expected in test_cases:
+        assert derive_property_id(project_id='project', project_dict=_project_dict(uris)) == expected, uris
+    assert derive_property_id(project_id='project', project_dict={}) is None
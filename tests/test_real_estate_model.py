@@ -0,0 +1,34 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from classification.classification_model import RealEstate
+
+def _real_estate() -> RealEstate:
+    return RealEstate(
+        categories=['Exterior', 'Living'],
+        boundary_priorities_small={'1': ['Exterior']},
+        boundary_priorities_large={'1': ['Exterior'], '-1': ['Living']},
+        interior_order=['Living']
+    )
+
+def test_boundary_priorities_serialize_with_string_keys():
+    """Test that integer boundary keys are dumped as strings"""
+    dumped = _real_estate().model_dump()
+    assert dumped['boundary_priorities_small'] == {'1': ['Exterior']}
+    assert dumped['boundary_priorities_large'] == {'1': ['Exterior'], '-1': ['Living']}
+
+def test_boundary_priorities_serialize_current_values():
+    """Test that copies, reassignments and in-place edits are all reflected in the dump"""
+    real_estate = _real_estate()
+    real_estate.model_dump()
+    
+    copied = real_estate.model_copy(update={'boundary_priorities_small': {9: ['Living']}})
+    assert copied.model_dump()['boundary_priorities_small'] == {'9': ['Living']}
+    assert real_estate.model_dump()['boundary_priorities_small'] == {'1': ['Exterior']}
+    
+    real_estate.boundary_priorities_small = {2: ['Living']}
+    assert real_estate.model_dump()['boundary_priorities_small'] == {'2': ['Living']}
+    
+    real_estate.boundary_priorities_large[5] = ['Exterior']
+    assert real_estate.model_dump()['boundary_priorities_large'] == {'1': ['Exterior'], '-1': ['Living'], '5': ['Exterior']}
@@ -0,0 +1,16 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from classification.legacy.legacy_video_classification_manager import VideoClassificationManager
+
+
+def test_load_room_mapping_is_not_empty():
+    # Skip __init__ so no Vision / Video Intelligence clients are created
+    manager = object.__new__(VideoClassificationManager)
+    mapping = manager._load_room_mapping()
+    
+    assert mapping
+    for room_type in ('living room', 'kitchen'):
+        assert room_type in mapping
+        assert mapping[room_type]
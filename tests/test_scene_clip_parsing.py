@@ -0,0 +1,47 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from classification.media_detector import MediaTypeDetector
+
+SCENE_CLIPS_PATH = 'gs://bucket/user/project/scene_clips'
+
+def test_parse_scene_clip():
+    """Test scene clip filenames parse as with the `_`-split parser ({video_id}_scene_{idx}_{start}_{end}.{ext})"""
+    
+    # filename -> (clip_id, start_time, end_time), None when the filename falls back to defaults
+    test_cases = [
+        # Accepted
+        ("abc123_scene_001_0_12.mp4", ("abc123_scene_001", 0.0, 12.0)),
+        ("abc123_scene_2_12.5_20.mov", ("abc123_scene_2", 12.5, 20.0)),
+        ("abc123_scene_3_1_7.5.mp4", ("abc123_scene_3", 1.0, 7.0)),  # End part is read up to its 1st '.'
+        ("my_video_scene_4_3_9.mp4", ("my_video_scene_4", 3.0, 9.0)),
+        ("scene_5_0_4.mp4", ("scene_5", 0.0, 4.0)),
+        ("abc123_scene_x_1_2.mp4", ("abc123_scene_x", 1.0, 2.0)),
+        ("abc123_scene_6_1_2_extra.mp4", ("abc123_scene_6", 1.0, 2.0)),
+        ("abc123_scene_7_1_2", ("abc123_scene_7", 1.0, 2.0)),
+        ("abc123_scene_8_-1_1e1.mp4", ("abc123_scene_8", -1.0, 10.0)),
+        # Rejected
+        ("abc123_scene_1_2.mp4", None),
+        ("abc123_scene_1_a_2.mp4", None),
+        ("abc123_scene_1_1.2.3_4.mp4", None),
+        ("abc123_scene_1_2_.mp4", None),
+        ("abc123_scenes_1_2_3.mp4", None),
+        ("abc123_myscene_1_2_3.mp4", None),
+        ("abc123_scene.mp4", None),
+        ("abc123_scene_x_scene_1_2_3.mp4", None),  # Only the 1st 'scene' part is considered
+        ("clip_0001.mp4", None),
+    ]
+    
+    detector = MediaTypeDetector()
+    for filename, expected in test_cases:
+        scene_clip = detector._parse_scene_clip(f"{SCENE_CLIPS_PATH}/{filename}")
+        if expected is None:
+            assert scene_clip.source_video_uri == "unknown", filename
+            assert (scene_clip.start_time, scene_clip.end_time) == (0.0, 10.0), filename
+            assert scene_clip.clip_id == os.path.splitext(filename)[0], filename
+        else:
+            clip_id, start_time, end_time = expected
+            assert (scene_clip.clip_id, scene_clip.start_time, scene_clip.end_time) == expected, filename
+            assert scene_clip.duration == end_time - start_time, filename
+            assert scene_clip.source_video_uri == f"gs://bucket/user/project/videos/{filename.split('_', 1)[0]}.mp4", filename
@@ -0,0 +1,18 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from database.db_manager import unified_db_manager
+from services.session_service import MockDocumentReference
+from project.project_backfill import derive_version_stats
+
+def test_derive_version_stats_with_postgresql_refs(monkeypatch):
+    """Test that version stats derive (zeroed) from the PostgreSQL compatibility refs"""
+    monkeypatch.setattr(unified_db_manager, 'is_postgresql_active', lambda: True)
+    project_ref = MockDocumentReference('test-user', 'test-project', collection_name='projects')
+    
+    assert derive_version_stats(project_ref) == {
+        'state': {'success': 0, 'failure': 0, 'pending': 0},
+        'viewed': {'unviewed_count': 0},
+        'active': {'active_count': 0, 'deleted_count': 0}
+    }
@@ -0,0 +1,63 @@
+import sys
+import os
+import random
+from bisect import bisect_right
+from itertools import accumulate
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from classification.image_classification_manager import _WeightedBucket
+
+class _ScriptedRng():
+    """Stands in for np.random.Generator - `uniform` returns the scripted draws in order"""
+    def __init__(self, draws):
+        self.draws = iter(draws)
+        
+    def uniform(self, low, high):
+        return next(self.draws)
+
+def _cumulative_pick(weights, target):
+    # The previous selection: random.choices bisects the cumulative weights
+    return bisect_right(list(accumulate(weights)), target)
+
+def _assert_matches_cumulative(bucket, weights):
+    total = sum(weights)
+    assert bucket.total == total
+    # Every draw on a fine grid (including both ends of each item's span) picks the same item
+    targets = [i / 4 for i in range(total * 4)] + list(accumulate(w - 0.5 for w in weights if w))
+    for target in targets:
+        assert bucket.find(target) == _cumulative_pick(weights, target), (weights, target)
+
+def test_pick_distribution_matches_cumulative_weights():
+    """Test that draws pick the same items as the cumulative-weights implementation"""
+    test_cases = [
+        [5],
+        [1, 1, 1, 1],
+        [3, 0, 7, 2, 0, 1],
+        [10, 1, 4, 4, 9, 2, 6, 8, 3],
+        list(range(1, 18)),
+    ]
+    for weights in test_cases:
+        _assert_matches_cumulative(_WeightedBucket(weights), weights)
+
+def test_pop_sequence_matches_swap_pop():
+    """Test that swap-pops keep the tree in step with a list removed from the same way"""
+    rng = random.Random(7)
+    for size in [1, 2, 5, 8, 13]:
+        weights = [rng.randint(0, 12) for _ in range(size)]
+        weights[0] += 1
+        bucket = _WeightedBucket(weights)
+        while weights:
+            idx = rng.randrange(len(weights))
+            weights[idx] = weights[-1]
+            weights.pop()
+            bucket.pop(idx)
+            assert bucket.weights == weights
+            if sum(weights):
+                _assert_matches_cumulative(bucket, weights)
+
+def test_sample_clamps_to_last_item():
+    """Test that a draw landing on the total (float round-off) still returns a valid index"""
+    bucket = _WeightedBucket([2, 3, 5, 1])
+    bucket.pop(3)
+    rng = _ScriptedRng([0.0, 4.999, bucket.total])
+    assert [bucket.sample(rng) for _ in range(3)] == [0, 1, 2]